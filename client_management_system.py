@@ -4,19 +4,193 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 import logging
 import os
+import sys
+import csv
+import io
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from typing import List, Dict, Any, Optional
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
 import numpy as np
 import json
-import requests
+import heapq
+from bisect import bisect_right
+import re
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 import webbrowser
 
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Размер блока строк при чтении больших CSV файлов
+CSV_CHUNK_SIZE = 50000
+
+# Поля заказа в порядке колонок табличного представления
+ORDER_FIELDS = [
+    'id', 'customer_id', 'customer_name', 'date', 'book_title', 'author', 'genre',
+    'quantity', 'price', 'discount', 'final_price', 'total_amount',
+    'status', 'delivery_method', 'order_notes'
+]
+
+# Поля заказа с небольшим числом различных значений
+INTERNED_ORDER_FIELDS = ('author', 'genre', 'status', 'delivery_method')
+
+# Поддерживаемые форматы дат, сгруппированные по разделителю
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%m/%d/%Y", "%d-%m-%Y", "%Y/%m/%d")
+DATE_FORMATS_BY_SEPARATOR = {
+    separator: tuple(fmt for fmt in DATE_FORMATS if separator in fmt)
+    for separator in ('-', '.', '/')
+}
+DATE_SEPARATOR_RE = re.compile(r'^\d+([-./])')
+# Строгий формат ГГГГ-ММ-ДД для полей ввода дат в диалогах
+# (date.fromisoformat с Python 3.11 принимает и другие формы ISO 8601)
+ISO_DATE_RE = re.compile(r'\A\d{4}-\d{2}-\d{2}\Z', re.ASCII)
+# Десятичное число для числовых полей диалогов (без экспоненты, inf и nan)
+NUMBER_RE = re.compile(r'\A\s*[-+]?(?:\d+\.?\d*|\.\d+)\s*\Z', re.ASCII)
+
+# Задержка перед поиском после последнего нажатия клавиши, мс
+SEARCH_DEBOUNCE_MS = 200
+
+# Количество строк в одном пакетном INSERT при сохранении в PostgreSQL
+DB_PAGE_SIZE = 1000
+
+# Начиная с этого числа строк таблица сохраняется через COPY во временную таблицу
+DB_COPY_THRESHOLD = 10000
+
+# Наибольшее число одновременно открытых соединений с PostgreSQL
+DB_POOL_MAX_CONNECTIONS = 4
+
+# Количество строк, получаемых серверным курсором за одно обращение к PostgreSQL
+DB_FETCH_SIZE = 5000
+
+# Интервал проверки завершения фоновых операций из главного цикла Tk, мс
+BACKGROUND_POLL_MS = 100
+
+# Количество заказов, добавляемых в таблицу за один раз
+ORDER_TREE_PAGE_SIZE = 200
+
+
+# ========== ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ ==========
+
+def read_excel_values(file_path: str) -> pd.DataFrame:
+    """
+    Чтение первого листа Excel в DataFrame значениями ячеек
+    
+    Args:
+        file_path (str): Путь к файлу Excel
+    
+    Returns:
+        pd.DataFrame: Данные листа, первая строка - заголовки колонок
+    """
+    if not file_path.lower().endswith(('.xlsx', '.xlsm')):
+        return pd.read_excel(file_path)
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        return pd.read_excel(file_path)
+    
+    # Потоковое чтение openpyxl отдает строки кортежами значений, минуя
+    # поячеечное преобразование pandas; пустые строки в конце листа отбрасываются
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        records = [row for row in rows if any(value is not None for value in row)]
+    finally:
+        workbook.close()
+    return pd.DataFrame.from_records(records, columns=header)
+
+
+def write_excel_values(df: pd.DataFrame, file_path: str, sheet_name: str = 'Sheet1'):
+    """
+    Запись DataFrame в Excel только значениями, без стилей pandas
+    
+    Args:
+        df (pd.DataFrame): Данные для записи (индекс не записывается)
+        file_path (str): Путь к файлу Excel
+        sheet_name (str): Название листа
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        df.to_excel(file_path, sheet_name=sheet_name, index=False)
+        return
+    
+    # Потоковая книга openpyxl пишет строки сразу в файл, минуя форматирование ячеек pandas
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(column) for column in df.columns])
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        sheet.append(row)
+    workbook.save(file_path)
+
+
+@lru_cache(maxsize=4)
+def _load_json_cached(file_path: str, mtime: float):
+    """Разбор JSON файла; время изменения входит в ключ кэша, поэтому измененный файл читается заново"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_json_file(file_path: str) -> Dict[str, Any]:
+    """
+    Чтение JSON файла настроек с кэшированием до его изменения
+    
+    Args:
+        file_path (str): Путь к файлу
+    
+    Returns:
+        dict: Копия прочитанных настроек (вызывающий код может ее менять)
+    """
+    return dict(_load_json_cached(file_path, os.path.getmtime(file_path)))
+
+
+# Последняя запрошенная дата и ее строка ГГГГ-ММ-ДД
+_today_iso_cache = [None, None]
+
+
+def today_iso() -> str:
+    """Сегодняшняя дата в формате ГГГГ-ММ-ДД (строка форматируется один раз в день)"""
+    today = date.today()
+    if _today_iso_cache[0] != today:
+        _today_iso_cache[:] = [today, today.isoformat()]
+    return _today_iso_cache[1]
+
+
+def is_iso_date(value_str: str) -> bool:
+    """
+    Проверка, что строка является существующей датой в формате ГГГГ-ММ-ДД
+    
+    Args:
+        value_str (str): Очищенная строка даты
+    
+    Returns:
+        bool: True, если дата корректна
+    """
+    if not ISO_DATE_RE.match(value_str):
+        return False
+    try:
+        date.fromisoformat(value_str)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_number(value_str: str):
+    """
+    Преобразование строки в число: целое без лишних затрат, дробное через float
+    
+    Args:
+        value_str (str): Очищенная строка числа
+    
+    Returns:
+        int | float: Число (ValueError, если строка не является числом)
+    """
+    return int(value_str) if value_str.isdigit() else float(value_str)
 
 
 # ========== ВСПОМОГАТЕЛЬНЫЕ КЛАССЫ ==========
@@ -31,8 +205,23 @@ class MetabaseIntegration:
         self.database_id = config.get('database_id')
         self.logger = logging.getLogger(__name__)
         
+        # requests загружается только при включенной интеграции, а не при запуске программы
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Одна HTTP-сессия на все запросы: соединение с Metabase переиспользуется (keep-alive)
+        self.http_session = requests.Session()
+        self.http_session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                              max_retries=Retry(total=3, backoff_factor=0.3))
+        self.http_session.mount('http://', adapter)
+        self.http_session.mount('https://', adapter)
+        
     def connect(self) -> bool:
         """Подключение к Metabase API"""
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+        
         try:
             # Проверяем, включена ли интеграция
             if not self.config.get('enabled', False):
@@ -45,22 +234,22 @@ class MetabaseIntegration:
                 "password": self.config['password']
             }
             
-            response = requests.post(
+            response = self.http_session.post(
                 f"{self.base_url}/api/session",
                 json=auth_data,
-                headers={"Content-Type": "application/json"},
                 timeout=10
             )
             
             if response.status_code == 200:
                 self.session_id = response.json()['id']
+                self.http_session.headers["X-Metabase-Session"] = self.session_id
                 self.logger.info("Успешное подключение к Metabase API")
                 return True
             else:
                 self.logger.error(f"Ошибка подключения: {response.status_code} - {response.text}")
                 return False
                 
-        except requests.exceptions.ConnectionError:
+        except RequestsConnectionError:
             self.logger.warning("Metabase недоступен, проверьте запущен ли контейнер")
             return False
         except Exception as e:
@@ -78,9 +267,8 @@ class MetabaseIntegration:
                 self.logger.warning("ID базы данных не указан")
                 return False
             
-            response = requests.post(
+            response = self.http_session.post(
                 f"{self.base_url}/api/database/{self.database_id}/sync_schema",
-                headers=self._get_headers(),
                 timeout=30
             )
             
@@ -109,10 +297,9 @@ class MetabaseIntegration:
                 "collection_id": self.config.get('collection_id')
             }
             
-            response = requests.post(
+            response = self.http_session.post(
                 f"{self.base_url}/api/dashboard",
                 json=dashboard_data,
-                headers=self._get_headers(),
                 timeout=10
             )
             
@@ -131,21 +318,68 @@ class MetabaseIntegration:
     def get_dashboard_url(self, dashboard_id: int) -> str:
         """Получение URL дашборда"""
         return f"{self.base_url}/dashboard/{dashboard_id}"
-    
-    def _get_headers(self) -> Dict[str, str]:
-        """Получение заголовков для API запросов"""
-        return {
-            "Content-Type": "application/json",
-            "X-Metabase-Session": self.session_id
-        }
 
 
 class DatabaseManager:
     """Менеджер для работы с PostgreSQL базой данных"""
     
+    # Колонки таблиц в порядке значений строки и колонки, обновляемые при конфликте id
+    CUSTOMER_COLUMNS = ('id', 'full_name', 'email', 'phone', 'registration_date', 'notes',
+                        'total_orders', 'total_spent')
+    CUSTOMER_UPDATE_COLUMNS = ('full_name', 'email', 'phone', 'notes', 'total_orders', 'total_spent')
+    ORDER_COLUMNS = ('id', 'customer_id', 'customer_name', 'order_date', 'book_title',
+                     'author', 'genre', 'quantity', 'price', 'discount', 'final_price',
+                     'total_amount', 'status', 'delivery_method', 'order_notes')
+    ORDER_UPDATE_COLUMNS = ORDER_COLUMNS[1:]
+    
+    # Таблицы, сохраняемые через UPSERT: колонки строки и колонки, обновляемые при конфликте id
+    UPSERT_TABLES = {
+        'customers': (CUSTOMER_COLUMNS, CUSTOMER_UPDATE_COLUMNS),
+        'orders': (ORDER_COLUMNS, ORDER_UPDATE_COLUMNS),
+    }
+    
+    # Итоги клиентов пересчитываются в базе по сохраненным заказам одной агрегацией;
+    # строки с уже верными итогами не переписываются
+    UPDATE_CUSTOMER_TOTALS = """
+        UPDATE customers c
+        SET total_orders = s.order_count, total_spent = s.amount
+        FROM (
+            SELECT customer_id, COUNT(*) AS order_count, COALESCE(SUM(total_amount), 0) AS amount
+            FROM orders
+            GROUP BY customer_id
+        ) s
+        WHERE c.id = s.customer_id
+          AND (c.total_orders IS DISTINCT FROM s.order_count OR c.total_spent IS DISTINCT FROM s.amount)
+    """
+    
+    # Значения для полей, которых нет в записи; дата регистрации подставляется при сохранении
+    CUSTOMER_DEFAULTS = {'full_name': '', 'email': '', 'phone': '', 'notes': '',
+                         'total_orders': 0, 'total_spent': 0.0}
+    ORDER_DEFAULTS = {'customer_id': 0, 'customer_name': '', 'book_title': '', 'author': '', 'genre': '',
+                      'quantity': 1, 'price': 0.0, 'discount': 0.0, 'final_price': 0.0, 'total_amount': 0.0,
+                      'status': 'Ожидает оплаты', 'delivery_method': '', 'order_notes': ''}
+    
+    # Строка таблицы из записи с подставленными значениями по умолчанию
+    get_customer_row = itemgetter(*CUSTOMER_COLUMNS)
+    get_order_row = itemgetter(*ORDER_FIELDS)
+    
+    # Вторичные индексы: имя и определение. Загрузка сортирует заказы по дате,
+    # отчеты в Metabase группируют по статусу и ищут последний заказ клиента
+    SECONDARY_INDEXES = (
+        ('idx_customers_name', 'customers(full_name)'),
+        ('idx_orders_customer_id', 'orders(customer_id)'),
+        ('idx_orders_date', 'orders(order_date)'),
+        ('idx_orders_status', 'orders(status)'),
+        ('idx_orders_customer_date', 'orders(customer_id, order_date DESC)'),
+    )
+    
     def __init__(self):
-        self.connection = None
-        self.cursor = None
+        self.pool = None
+        # Тексты UPSERT-запросов собираются один раз, а не при каждом сохранении
+        self._upsert_statements = {
+            table: self._build_upsert_statements(table, columns, update_columns)
+            for table, (columns, update_columns) in self.UPSERT_TABLES.items()
+        }
         self.connect()
     
     def connect(self):
@@ -158,7 +392,10 @@ class DatabaseManager:
             db_user = os.getenv('DATABASE_USER', 'postgres')
             db_password = os.getenv('DATABASE_PASSWORD', 'password')
             
-            self.connection = psycopg2.connect(
+            # Пул соединений: каждая операция берет свое соединение,
+            # поэтому обращения из фоновых потоков не делят один курсор
+            self.pool = ThreadedConnectionPool(
+                1, DB_POOL_MAX_CONNECTIONS,
                 host=db_host,
                 port=db_port,
                 database=db_name,
@@ -166,190 +403,231 @@ class DatabaseManager:
                 password=db_password,
                 cursor_factory=DictCursor
             )
-            self.cursor = self.connection.cursor()
             logging.info(f"Успешное подключение к PostgreSQL: {db_host}:{db_port}/{db_name}")
             
         except Exception as e:
             logging.error(f"Ошибка подключения к PostgreSQL: {e}")
             # Возвращаемся к CSV-файлам
-            self.connection = None
+            self.pool = None
+    
+    @contextmanager
+    def _connection(self):
+        """Соединение из пула на время одной операции"""
+        connection = self.pool.getconn()
+        try:
+            yield connection
+        finally:
+            self.pool.putconn(connection)
     
     def save_to_database(self, customers, orders):
         """Сохранение данных в PostgreSQL"""
-        if not self.connection:
+        if not self.pool:
             logging.warning("Нет подключения к БД, используется CSV")
             return False
         
-        try:
-            # Сначала создаем таблицы если они не существуют
-            self._create_tables_if_not_exists()
-            
-            # Сохраняем клиентов
-            for customer in customers:
-                self.cursor.execute("""
-                    INSERT INTO customers (id, full_name, email, phone, registration_date, notes, total_orders, total_spent)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE SET
-                        full_name = EXCLUDED.full_name,
-                        email = EXCLUDED.email,
-                        phone = EXCLUDED.phone,
-                        notes = EXCLUDED.notes,
-                        total_orders = EXCLUDED.total_orders,
-                        total_spent = EXCLUDED.total_spent,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (
-                    customer['id'],
-                    customer.get('full_name', ''),
-                    customer.get('email', ''),
-                    customer.get('phone', ''),
-                    customer.get('registration_date', date.today()),
-                    customer.get('notes', ''),
-                    customer.get('total_orders', 0),
-                    customer.get('total_spent', 0.0)
-                ))
-            
-            # Сохраняем заказы
-            for order in orders:
-                self.cursor.execute("""
-                    INSERT INTO orders (id, customer_id, customer_name, order_date, book_title, 
-                                      author, genre, quantity, price, discount, final_price, 
-                                      total_amount, status, delivery_method, order_notes)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE SET
-                        customer_id = EXCLUDED.customer_id,
-                        customer_name = EXCLUDED.customer_name,
-                        order_date = EXCLUDED.order_date,
-                        book_title = EXCLUDED.book_title,
-                        author = EXCLUDED.author,
-                        genre = EXCLUDED.genre,
-                        quantity = EXCLUDED.quantity,
-                        price = EXCLUDED.price,
-                        discount = EXCLUDED.discount,
-                        final_price = EXCLUDED.final_price,
-                        total_amount = EXCLUDED.total_amount,
-                        status = EXCLUDED.status,
-                        delivery_method = EXCLUDED.delivery_method,
-                        order_notes = EXCLUDED.order_notes,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (
-                    order['id'],
-                    order.get('customer_id', 0),
-                    order.get('customer_name', ''),
-                    order.get('date', date.today()),
-                    order.get('book_title', ''),
-                    order.get('author', ''),
-                    order.get('genre', ''),
-                    order.get('quantity', 1),
-                    order.get('price', 0.0),
-                    order.get('discount', 0.0),
-                    order.get('final_price', 0.0),
-                    order.get('total_amount', 0.0),
-                    order.get('status', 'Ожидает оплаты'),
-                    order.get('delivery_method', ''),
-                    order.get('order_notes', '')
-                ))
-            
-            self.connection.commit()
-            logging.info(f"Данные сохранены в PostgreSQL: {len(customers)} клиентов, {len(orders)} заказов")
-            return True
+        with self._connection() as connection:
+            try:
+                # Сначала создаем таблицы если они не существуют
+                self._create_tables_if_not_exists(connection)
+                
+                # Строки собираются по id: в одном пакете ON CONFLICT не может обновить строку дважды,
+                # поэтому при повторе id остается последняя запись, как при построчной вставке.
+                # Значения берутся одним itemgetter из записи, дополненной значениями по умолчанию
+                today = date.today()
+                customer_defaults = {**self.CUSTOMER_DEFAULTS, 'registration_date': today}
+                order_defaults = {**self.ORDER_DEFAULTS, 'date': today}
+                customer_rows = {
+                    row[0]: row
+                    for row in map(self.get_customer_row, ({**customer_defaults, **customer} for customer in customers))
+                }
+                order_rows = {
+                    row[0]: row
+                    for row in map(self.get_order_row, ({**order_defaults, **order} for order in orders))
+                }
+                
+                # Сохраняем клиентов и заказы пакетами вместо отдельного запроса на каждую строку;
+                # обе таблицы пишутся в одной транзакции, так как заказы ссылаются на клиентов
+                with connection.cursor() as cursor:
+                    # Строки передаются без копирования в список: execute_values сам делит их на страницы
+                    self._upsert_rows(cursor, 'customers', customer_rows.values())
+                    self._upsert_rows(cursor, 'orders', order_rows.values())
+                    cursor.execute(self.UPDATE_CUSTOMER_TOTALS)
+                
+                connection.commit()
+                logging.info(f"Данные сохранены в PostgreSQL: {len(customers)} клиентов, {len(orders)} заказов")
+                return True
             
-        except Exception as e:
-            self.connection.rollback()
-            logging.error(f"Ошибка сохранения в PostgreSQL: {e}")
-            return False
+            except Exception as e:
+                connection.rollback()
+                logging.error(f"Ошибка сохранения в PostgreSQL: {e}")
+                return False
+    
+    @staticmethod
+    def _build_upsert_statements(table, columns, update_columns):
+        """
+        Тексты запросов вставки или обновления строк таблицы по id
+        
+        Args:
+            table (str): Имя таблицы
+            columns (tuple): Колонки в порядке значений строки
+            update_columns (tuple): Колонки, обновляемые при конфликте id
+        
+        Returns:
+            dict: Запросы для пакетного INSERT и для загрузки через временную таблицу
+        """
+        column_list = ', '.join(columns)
+        conflict_sql = "ON CONFLICT (id) DO UPDATE SET " + ", ".join(
+            [f"{column} = EXCLUDED.{column}" for column in update_columns] +
+            ["updated_at = CURRENT_TIMESTAMP"]
+        )
+        staging_table = f"tmp_{table}"
+        
+        return {
+            'values': f"INSERT INTO {table} ({column_list}) VALUES %s {conflict_sql}",
+            'create_staging': f"CREATE TEMP TABLE {staging_table} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP",
+            'copy': f"COPY {staging_table} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            'merge_staging': f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging_table} {conflict_sql}",
+        }
+    
+    def _upsert_rows(self, cursor, table, rows):
+        """
+        Вставка или обновление строк таблицы по id
+        
+        Args:
+            cursor: Курсор открытой транзакции
+            table (str): Имя таблицы из UPSERT_TABLES
+            rows (Collection): Кортежи значений без повторяющихся id
+        """
+        statements = self._upsert_statements[table]
+        
+        if len(rows) < DB_COPY_THRESHOLD:
+            execute_values(cursor, statements['values'], rows, page_size=DB_PAGE_SIZE)
+            return
+        
+        # Большие объемы передаются одним потоком COPY во временную таблицу,
+        # откуда сливаются в основную одним INSERT ... SELECT
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerows(tuple('\\N' if value is None else value for value in row) for row in rows)
+        buffer.seek(0)
+        
+        cursor.execute(statements['create_staging'])
+        cursor.copy_expert(statements['copy'], buffer)
+        cursor.execute(statements['merge_staging'])
+    
+    def _create_indexes(self, cursor):
+        """Создание вторичных индексов, которых еще нет"""
+        for name, definition in self.SECONDARY_INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
     
     def load_from_database(self):
         """Загрузка данных из PostgreSQL"""
-        if not self.connection:
+        if not self.pool:
             logging.warning("Нет подключения к БД, загружаем из CSV")
             return None, None
         
-        try:
-            # Проверяем существование таблиц
-            self._create_tables_if_not_exists()
-            
-            # Загружаем клиентов
-            self.cursor.execute("SELECT * FROM customers ORDER BY id")
-            customers = []
-            for row in self.cursor.fetchall():
-                customers.append(dict(row))
-            
-            # Загружаем заказы
-            self.cursor.execute("SELECT * FROM orders ORDER BY order_date")
-            orders = []
-            for row in self.cursor.fetchall():
-                orders.append(dict(row))
-            
-            logging.info(f"Загружено из PostgreSQL: {len(customers)} клиентов, {len(orders)} заказов")
-            return customers, orders
+        with self._connection() as connection:
+            try:
+                # Проверяем существование таблиц
+                self._create_tables_if_not_exists(connection)
+                
+                # Загружаем клиентов и заказы
+                # Читаются только колонки, которые сохраняет приложение; дата заказа
+                # возвращается под ключом 'date', который используют записи заказов
+                customer_columns = ', '.join(self.CUSTOMER_COLUMNS)
+                order_columns = ', '.join(
+                    'order_date AS date' if column == 'order_date' else column for column in self.ORDER_COLUMNS
+                )
+                customers = self._fetch_dicts(connection, 'stream_customers',
+                                              f"SELECT {customer_columns} FROM customers ORDER BY id")
+                orders = self._fetch_dicts(connection, 'stream_orders',
+                                           f"SELECT {order_columns} FROM orders ORDER BY order_date")
+                # Транзакция чтения завершается, чтобы соединение вернулось в пул свободным
+                connection.commit()
+                
+                logging.info(f"Загружено из PostgreSQL: {len(customers)} клиентов, {len(orders)} заказов")
+                return customers, orders
             
-        except Exception as e:
-            logging.error(f"Ошибка загрузки из PostgreSQL: {e}")
-            return None, None
+            except Exception as e:
+                connection.rollback()
+                logging.error(f"Ошибка загрузки из PostgreSQL: {e}")
+                return None, None
+    
+    def _fetch_dicts(self, connection, cursor_name, query):
+        """
+        Чтение результата запроса серверным курсором порциями по DB_FETCH_SIZE строк
+        
+        Args:
+            connection: Соединение из пула
+            cursor_name (str): Имя серверного курсора
+            query (str): Запрос SELECT
+        
+        Returns:
+            list: Строки в виде словарей
+        """
+        # Клиент держит в памяти только текущую порцию строк, а не весь результат libpq
+        with connection.cursor(cursor_name) as cursor:
+            cursor.itersize = DB_FETCH_SIZE
+            cursor.execute(query)
+            return [dict(row) for row in cursor]
     
-    def _create_tables_if_not_exists(self):
+    def _create_tables_if_not_exists(self, connection):
         """Создание таблиц если они не существуют"""
         try:
-            # Таблица клиентов
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS customers (
-                    id SERIAL PRIMARY KEY,
-                    full_name VARCHAR(255) NOT NULL,
-                    email VARCHAR(255),
-                    phone VARCHAR(50),
-                    registration_date DATE NOT NULL,
-                    notes TEXT,
-                    total_orders INTEGER DEFAULT 0,
-                    total_spent DECIMAL(10,2) DEFAULT 0.0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Таблица заказов
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS orders (
-                    id VARCHAR(50) PRIMARY KEY,
-                    customer_id INTEGER REFERENCES customers(id) ON DELETE CASCADE,
-                    customer_name VARCHAR(255) NOT NULL,
-                    order_date DATE NOT NULL,
-                    book_title VARCHAR(255) NOT NULL,
-                    author VARCHAR(255),
-                    genre VARCHAR(100),
-                    quantity INTEGER DEFAULT 1,
-                    price DECIMAL(10,2) NOT NULL,
-                    discount DECIMAL(5,2) DEFAULT 0.0,
-                    final_price DECIMAL(10,2) NOT NULL,
-                    total_amount DECIMAL(10,2) NOT NULL,
-                    status VARCHAR(50) DEFAULT 'Ожидает оплаты',
-                    delivery_method VARCHAR(100),
-                    order_notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Индексы
-            self.cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_customers_name ON customers(full_name)
-            """)
-            self.cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_orders_customer_id ON orders(customer_id)
-            """)
-            
-            self.connection.commit()
+            with connection.cursor() as cursor:
+                # Таблица клиентов
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS customers (
+                        id SERIAL PRIMARY KEY,
+                        full_name VARCHAR(255) NOT NULL,
+                        email VARCHAR(255),
+                        phone VARCHAR(50),
+                        registration_date DATE NOT NULL,
+                        notes TEXT,
+                        total_orders INTEGER DEFAULT 0,
+                        total_spent DECIMAL(10,2) DEFAULT 0.0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Таблица заказов
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS orders (
+                        id VARCHAR(50) PRIMARY KEY,
+                        customer_id INTEGER REFERENCES customers(id) ON DELETE CASCADE,
+                        customer_name VARCHAR(255) NOT NULL,
+                        order_date DATE NOT NULL,
+                        book_title VARCHAR(255) NOT NULL,
+                        author VARCHAR(255),
+                        genre VARCHAR(100),
+                        quantity INTEGER DEFAULT 1,
+                        price DECIMAL(10,2) NOT NULL,
+                        discount DECIMAL(5,2) DEFAULT 0.0,
+                        final_price DECIMAL(10,2) NOT NULL,
+                        total_amount DECIMAL(10,2) NOT NULL,
+                        status VARCHAR(50) DEFAULT 'Ожидает оплаты',
+                        delivery_method VARCHAR(100),
+                        order_notes TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Индексы
+                self._create_indexes(cursor)
+                
+                connection.commit()
             
         except Exception as e:
-            self.connection.rollback()
+            connection.rollback()
             logging.error(f"Ошибка создания таблиц: {e}")
             raise
     
     def close(self):
         """Закрытие соединения"""
-        if self.connection:
-            if self.cursor:
-                self.cursor.close()
-            self.connection.close()
+        if self.pool:
+            self.pool.closeall()
 
 
 class OrderManager:
@@ -390,135 +668,136 @@ class OrderManager:
 class ReportGenerator:
     """Генератор отчетов"""
     
-    def generate_report(self, report_type, customers, orders, date_from=None, date_to=None):
+    def generate_report(self, report_type, customers, orders, date_from=None, date_to=None, orders_df=None):
         """Генерация отчета по типу"""
+        # Агрегаты по заказам считаются по колоночному представлению;
+        # приложение передает уже построенную таблицу, иначе она строится здесь
+        if orders_df is None:
+            orders_df = pd.DataFrame.from_records(orders, columns=ORDER_FIELDS)
+        
         if report_type == "customer_summary":
-            return self.generate_customer_summary(customers, orders)
+            return self.generate_customer_summary(customers, orders_df)
         elif report_type == "registration_analysis":
             return self.generate_registration_analysis(customers, date_from, date_to)
         elif report_type == "order_statistics":
-            return self.generate_order_statistics(orders, date_from, date_to)
+            return self.generate_order_statistics(orders_df, date_from, date_to)
         elif report_type == "customer_activity":
-            return self.generate_customer_activity(customers, orders, date_from, date_to)
+            return self.generate_customer_activity(customers, orders_df, date_from, date_to)
         else:
             return "Неизвестный тип отчета"
     
-    def generate_customer_summary(self, customers, orders):
+    def _aggregate_orders_by_customer(self, orders_df):
+        """Количество и сумма заказов по каждому клиенту: {ID клиента: (количество, сумма)}"""
+        totals = orders_df.groupby('customer_id', sort=False)['total_amount'].agg(['size', 'sum'])
+        return dict(zip(totals.index.tolist(), zip(totals['size'].tolist(), totals['sum'].tolist())))
+    
+    def generate_customer_summary(self, customers, orders_df):
         """Генерация сводки по клиентам"""
-        order_manager = OrderManager()
+        totals = self._aggregate_orders_by_customer(orders_df)
         
-        report = "ОТЧЕТ ПО КЛИЕНТАМ - СВОДКА\n"
-        report += "=" * 50 + "\n\n"
+        # Части отчета собираются в список и соединяются один раз в конце
+        report = ["ОТЧЕТ ПО КЛИЕНТАМ - СВОДКА\n"]
+        report.append("=" * 50 + "\n\n")
         
-        report += f"Всего клиентов: {len(customers)}\n"
+        report.append(f"Всего клиентов: {len(customers)}\n")
         
         # Статистика по заказам
         customers_with_orders = 0
         total_revenue = 0
         
         for customer in customers:
-            customer_orders = order_manager.get_customer_orders(customer['id'], orders)
-            if customer_orders:
+            order_count, total_spent = totals.get(customer['id'], (0, 0.0))
+            if order_count:
                 customers_with_orders += 1
-                total_revenue += order_manager.get_customer_total_spent(customer['id'], orders)
+                total_revenue += total_spent
         
-        report += f"Клиентов с заказами: {customers_with_orders}\n"
-        report += f"Общая выручка: {total_revenue:.2f} руб.\n\n"
+        report.append(f"Клиентов с заказами: {customers_with_orders}\n")
+        report.append(f"Общая выручка: {total_revenue:.2f} руб.\n\n")
         
         # Детали по клиентам
-        report += "ДЕТАЛИ ПО КЛИЕНТАМ:\n"
-        report += "-" * 40 + "\n"
+        report.append("ДЕТАЛИ ПО КЛИЕНТАМ:\n")
+        report.append("-" * 40 + "\n")
         
         for customer in customers:
-            customer_orders = order_manager.get_customer_orders(customer['id'], orders)
-            total_spent = order_manager.get_customer_total_spent(customer['id'], orders)
+            order_count, total_spent = totals.get(customer['id'], (0, 0.0))
             
-            report += f"ID: {customer['id']} | ФИО: {customer['full_name']}\n"
-            report += f"    Заказов: {len(customer_orders)} | Потрачено: {total_spent:.2f} руб.\n"
-            report += f"    Зарегистрирован: {customer['registration_date']}\n\n"
+            report.append(f"ID: {customer['id']} | ФИО: {customer['full_name']}\n")
+            report.append(f"    Заказов: {order_count} | Потрачено: {total_spent:.2f} руб.\n")
+            report.append(f"    Зарегистрирован: {customer['registration_date']}\n\n")
         
-        return report
+        return "".join(report)
     
     def generate_registration_analysis(self, customers, date_from=None, date_to=None):
         """Анализ регистраций"""
-        report = "АНАЛИЗ РЕГИСТРАЦИЙ КЛИЕНТОВ\n"
-        report += "=" * 50 + "\n\n"
-        
-        # Группировка по месяцам
-        from collections import defaultdict
-        monthly_registrations = defaultdict(int)
+        report = ["АНАЛИЗ РЕГИСТРАЦИЙ КЛИЕНТОВ\n"]
+        report.append("=" * 50 + "\n\n")
         
-        for customer in customers:
-            reg_date = customer.get('registration_date')
-            if reg_date:
-                # Извлекаем год и месяц
-                year_month = reg_date[:7]  # YYYY-MM
-                monthly_registrations[year_month] += 1
+        # Группировка по месяцам (год и месяц YYYY-MM) одним подсчетом по колонке
+        reg_dates = pd.Series([customer.get('registration_date') for customer in customers], dtype=object)
+        reg_dates = reg_dates[reg_dates.astype(bool)].astype(str)
+        monthly_registrations = reg_dates.str.slice(0, 7).value_counts().sort_index()
         
-        report += "РЕГИСТРАЦИИ ПО МЕСЯЦАМ:\n"
-        report += "-" * 25 + "\n"
+        report.append("РЕГИСТРАЦИИ ПО МЕСЯЦАМ:\n")
+        report.append("-" * 25 + "\n")
         
-        for month in sorted(monthly_registrations.keys()):
-            report += f"{month}: {monthly_registrations[month]} клиентов\n"
+        for month, count in monthly_registrations.items():
+            report.append(f"{month}: {count} клиентов\n")
         
-        report += f"\nВсего регистраций: {len(customers)}\n"
+        report.append(f"\nВсего регистраций: {len(customers)}\n")
         
-        return report
+        return "".join(report)
     
-    def generate_order_statistics(self, orders, date_from=None, date_to=None):
+    def generate_order_statistics(self, orders_df, date_from=None, date_to=None):
         """Статистика заказов"""
-        report = "СТАТИСТИКА ЗАКАЗОВ\n"
-        report += "=" * 40 + "\n\n"
+        report = ["СТАТИСТИКА ЗАКАЗОВ\n"]
+        report.append("=" * 40 + "\n\n")
         
-        if not orders:
-            return report + "Заказы не найдены.\n"
+        if orders_df.empty:
+            report.append("Заказы не найдены.\n")
+            return "".join(report)
         
-        total_orders = len(orders)
-        total_revenue = sum(order.get('total_amount', 0) for order in orders)
-        avg_order = total_revenue / total_orders if total_orders > 0 else 0
+        total_orders = len(orders_df)
+        total_revenue = orders_df['total_amount'].sum()
+        avg_order = total_revenue / total_orders
         
-        report += f"Всего заказов: {total_orders}\n"
-        report += f"Общая выручка: {total_revenue:.2f} руб.\n"
-        report += f"Средний чек: {avg_order:.2f} руб.\n\n"
+        report.append(f"Всего заказов: {total_orders}\n")
+        report.append(f"Общая выручка: {total_revenue:.2f} руб.\n")
+        report.append(f"Средний чек: {avg_order:.2f} руб.\n\n")
         
-        # Статистика по статусам
-        status_counts = {}
-        for order in orders:
-            status = order.get('status', 'Неизвестно')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # Статистика по статусам в порядке первого появления
+        status_counts = orders_df['status'].astype(object).fillna('Неизвестно').value_counts(sort=False)
         
-        report += "ЗАКАЗЫ ПО СТАТУСАМ:\n"
-        report += "-" * 20 + "\n"
+        report.append("ЗАКАЗЫ ПО СТАТУСАМ:\n")
+        report.append("-" * 20 + "\n")
         for status, count in status_counts.items():
-            report += f"{status}: {count}\n"
+            report.append(f"{status}: {count}\n")
         
-        return report
+        return "".join(report)
     
-    def generate_customer_activity(self, customers, orders, date_from=None, date_to=None):
+    def generate_customer_activity(self, customers, orders_df, date_from=None, date_to=None):
         """Активность клиентов"""
-        order_manager = OrderManager()
+        totals = self._aggregate_orders_by_customer(orders_df)
         
-        report = "АКТИВНОСТЬ КЛИЕНТОВ\n"
-        report += "=" * 40 + "\n\n"
+        report = ["АКТИВНОСТЬ КЛИЕНТОВ\n"]
+        report.append("=" * 40 + "\n\n")
         
         # Сортировка клиентов по количеству заказов
         customers_with_orders = []
         for customer in customers:
-            customer_orders = order_manager.get_customer_orders(customer['id'], orders)
-            if customer_orders:
-                customers_with_orders.append((customer, len(customer_orders)))
+            order_count, total_spent = totals.get(customer['id'], (0, 0.0))
+            if order_count:
+                customers_with_orders.append((customer, order_count, total_spent))
         
-        # Сортировка по убыванию количества заказов
-        customers_with_orders.sort(key=lambda x: x[1], reverse=True)
+        # Топ 10 по убыванию количества заказов без полной сортировки
+        top_customers = heapq.nlargest(10, customers_with_orders, key=lambda x: x[1])
         
-        report += "ТОП КЛИЕНТОВ ПО КОЛИЧЕСТВУ ЗАКАЗОВ:\n"
-        report += "-" * 45 + "\n"
+        report.append("ТОП КЛИЕНТОВ ПО КОЛИЧЕСТВУ ЗАКАЗОВ:\n")
+        report.append("-" * 45 + "\n")
         
-        for customer, order_count in customers_with_orders[:10]:  # Топ 10
-            total_spent = order_manager.get_customer_total_spent(customer['id'], orders)
-            report += f"{customer['full_name']}: {order_count} заказов, {total_spent:.2f} руб. потрачено\n"
+        for customer, order_count, total_spent in top_customers:
+            report.append(f"{customer['full_name']}: {order_count} заказов, {total_spent:.2f} руб. потрачено\n")
         
-        return report
+        return "".join(report)
 
 
 class ExcelDataImporter:
@@ -527,6 +806,8 @@ class ExcelDataImporter:
     def __init__(self, main_app):
         self.main_app = main_app
         self.logger = logging.getLogger(__name__)
+        # Счетчик проблемных строк и ячеек, выводится одной записью после импорта
+        self._parse_warnings = Counter()
     
     def import_customers_from_excel(self, file_path=None):
         """
@@ -538,6 +819,8 @@ class ExcelDataImporter:
         Returns:
             list: Список клиентов
         """
+        if self.main_app.is_data_locked():
+            return None
         if not file_path:
             file_path = filedialog.askopenfilename(
                 title="Выберите Excel файл с клиентами",
@@ -551,24 +834,7 @@ class ExcelDataImporter:
             return None
         
         try:
-            self.logger.info(f"Начинаю импорт клиентов из {file_path}")
-            
-            # Чтение Excel файла
-            df = pd.read_excel(file_path)
-            self.logger.info(f"Загружено {len(df)} строк из файла")
-            
-            # Преобразование данных
-            customers = []
-            customer_id_start = self.main_app.next_customer_id
-            
-            for index, row in df.iterrows():
-                customer = self._process_customer_row(row, customer_id_start + index)
-                if customer:
-                    customers.append(customer)
-            
-            self.logger.info(f"Успешно обработано {len(customers)} клиентов")
-            return customers
-            
+            return self._import_customers_frame(self._read_import_file(file_path, "клиентов"))
         except Exception as e:
             self.logger.error(f"Ошибка импорта клиентов: {e}")
             messagebox.showerror("Ошибка импорта", f"Не удалось импортировать клиентов:\n{str(e)}")
@@ -584,6 +850,8 @@ class ExcelDataImporter:
         Returns:
             list: Список заказов
         """
+        if self.main_app.is_data_locked():
+            return None
         if not file_path:
             file_path = filedialog.askopenfilename(
                 title="Выберите Excel файл с заказами",
@@ -597,155 +865,168 @@ class ExcelDataImporter:
             return None
         
         try:
-            self.logger.info(f"Начинаю импорт заказов из {file_path}")
-            
-            # Чтение Excel файла
-            df = pd.read_excel(file_path)
-            self.logger.info(f"Загружено {len(df)} строк из файла")
-            
-            # Преобразование данных
-            orders = []
-            order_id_start = self.main_app.next_order_id
-            
-            for index, row in df.iterrows():
-                order = self._process_order_row(row, order_id_start + index)
-                if order:
-                    orders.append(order)
-            
-            self.logger.info(f"Успешно обработано {len(orders)} заказов")
-            return orders
-            
+            return self._import_orders_frame(self._read_import_file(file_path, "заказов"))
         except Exception as e:
             self.logger.error(f"Ошибка импорта заказов: {e}")
             messagebox.showerror("Ошибка импорта", f"Не удалось импортировать заказы:\n{str(e)}")
             return None
     
-    def _process_customer_row(self, row, customer_id):
+    def _read_import_file(self, file_path, kind):
         """
-        Обработка строки с данными клиента
+        Чтение Excel файла импорта; не обращается к данным приложения и может выполняться в фоне
         
         Args:
-            row: Строка DataFrame
-            customer_id: ID клиента
+            file_path (str): Путь к файлу Excel
+            kind (str): Что импортируется, для журнала
         
         Returns:
-            dict: Данные клиента
+            pd.DataFrame: Прочитанный лист
         """
-        try:
-            # Маппинг возможных названий колонок
-            column_mapping = {
-                'ФИО': ['ФИО', 'full_name', 'Имя', 'Клиент', 'ФИО_клиента'],
-                'Email': ['Email', 'email', 'Почта'],
-                'Телефон': ['Телефон', 'phone', 'Мобильный'],
-                'Дата регистрации': ['Дата регистрации', 'registration_date', 'Дата'],
-                'Примечания': ['Примечания', 'notes', 'Комментарий']
-            }
-            
-            # Поиск значений по различным названиям колонок
-            customer_data = {
-                'id': customer_id,
-                'full_name': self._get_value_from_row(row, column_mapping['ФИО'], ''),
-                'email': self._get_value_from_row(row, column_mapping['Email'], ''),
-                'phone': self._get_value_from_row(row, column_mapping['Телефон'], ''),
-                'registration_date': self._parse_date(
-                    self._get_value_from_row(row, column_mapping['Дата регистрации'], datetime.now())
-                ),
-                'notes': self._get_value_from_row(row, column_mapping['Примечания'], ''),
-                'total_orders': 0,
-                'total_spent': 0.0
-            }
-            
-            # Если имя пустое, пропускаем запись
-            if not customer_data['full_name']:
-                return None
-            
-            return customer_data
-            
-        except Exception as e:
-            self.logger.warning(f"Ошибка обработки строки клиента: {e}")
-            return None
+        self.logger.info(f"Начинаю импорт {kind} из {file_path}")
+        df = read_excel_values(file_path)
+        self.logger.info(f"Загружено {len(df)} строк из файла")
+        return df
+    
+    def _import_customers_frame(self, df):
+        """Преобразование прочитанного листа в список клиентов (в главном потоке)"""
+        self._parse_warnings.clear()
+        customers = self._process_customer_frame(df, self.main_app.next_customer_id)
+        
+        self._log_parse_warnings()
+        self.logger.info(f"Успешно обработано {len(customers)} клиентов")
+        return customers
+    
+    def _import_orders_frame(self, df):
+        """Преобразование прочитанного листа в список заказов (в главном потоке)"""
+        self._parse_warnings.clear()
+        orders = self._process_order_frame(df, self.main_app.next_order_id)
+        
+        self._log_parse_warnings()
+        self.logger.info(f"Успешно обработано {len(orders)} заказов")
+        return orders
+    
+    # Возможные названия колонок Excel для полей клиента и заказа
+    CUSTOMER_COLUMN_MAPPING = {
+        'full_name': ['ФИО', 'full_name', 'Имя', 'Клиент', 'ФИО_клиента'],
+        'email': ['Email', 'email', 'Почта'],
+        'phone': ['Телефон', 'phone', 'Мобильный'],
+        'registration_date': ['Дата регистрации', 'registration_date', 'Дата'],
+        'notes': ['Примечания', 'notes', 'Комментарий']
+    }
+    ORDER_COLUMN_MAPPING = {
+        'id': ['ID_заказа', 'order_id', 'ID заказа'],
+        'customer_name': ['ФИО_клиента', 'client_name', 'Клиент', 'ФИО'],
+        'date': ['Дата_заказа', 'order_date', 'Дата'],
+        'book_title': ['Название_книги', 'book_title', 'Книга'],
+        'author': ['Автор', 'author'],
+        'genre': ['Жанр', 'genre', 'Категория'],
+        'quantity': ['Количество', 'quantity', 'Кол-во'],
+        'price': ['Цена_за_шт', 'price', 'Цена'],
+        'discount': ['Скидка_%', 'discount', 'Скидка'],
+        'status': ['Статус_заказа', 'status', 'Статус'],
+        'delivery_method': ['Способ_доставки', 'delivery_method', 'Доставка'],
+        'order_notes': ['Примечание_к_заказу', 'notes', 'Комментарий']
+    }
+    
+    # Форматы строковых дат в Excel файлах в порядке проверки
+    IMPORT_DATE_FORMATS = (
+        "%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%m/%d/%Y", "%Y.%m.%d", "%d-%m-%Y", "%Y/%m/%d"
+    )
+    
+    def _process_customer_frame(self, df, customer_id_start):
+        """
+        Преобразование таблицы Excel в список клиентов
+        
+        Args:
+            df (pd.DataFrame): Прочитанный лист Excel
+            customer_id_start (int): ID клиента для первой строки листа
+        
+        Returns:
+            list: Данные клиентов
+        """
+        mapping = self.CUSTOMER_COLUMN_MAPPING
+        customers = pd.DataFrame({
+            'id': customer_id_start + np.arange(len(df)),
+            'full_name': self._get_column(df, mapping['full_name'], ''),
+            'email': self._get_column(df, mapping['email'], ''),
+            'phone': self._get_column(df, mapping['phone'], ''),
+            'registration_date': self._parse_date_column(self._get_column(df, mapping['registration_date'])),
+            'notes': self._get_column(df, mapping['notes'], ''),
+            'total_orders': 0,
+            'total_spent': 0.0
+        }, index=df.index)
+        
+        # Записи без имени пропускаются, ID остальных соответствуют номеру строки
+        customers = customers[customers['full_name'].astype(bool)]
+        return customers.to_dict('records')
     
-    def _process_order_row(self, row, order_index):
+    def _process_order_frame(self, df, order_id_start):
         """
-        Обработка строки с данными заказа
+        Преобразование таблицы Excel в список заказов
         
         Args:
-            row: Строка DataFrame
-            order_index: Индекс заказа
+            df (pd.DataFrame): Прочитанный лист Excel
+            order_id_start (int): Номер заказа для первой строки листа
         
         Returns:
-            dict: Данные заказа
+            list: Данные заказов
         """
-        try:
-            # Маппинг возможных названий колонок
-            column_mapping = {
-                'ID_заказа': ['ID_заказа', 'order_id', 'ID заказа'],
-                'ФИО_клиента': ['ФИО_клиента', 'client_name', 'Клиент', 'ФИО'],
-                'Дата_заказа': ['Дата_заказа', 'order_date', 'Дата'],
-                'Название_книги': ['Название_книги', 'book_title', 'Книга'],
-                'Автор': ['Автор', 'author'],
-                'Жанр': ['Жанр', 'genre', 'Категория'],
-                'Количество': ['Количество', 'quantity', 'Кол-во'],
-                'Цена_за_шт': ['Цена_за_шт', 'price', 'Цена'],
-                'Скидка_%': ['Скидка_%', 'discount', 'Скидка'],
-                'Статус_заказа': ['Статус_заказа', 'status', 'Статус'],
-                'Способ_доставки': ['Способ_доставки', 'delivery_method', 'Доставка'],
-                'Примечание_к_заказу': ['Примечание_к_заказу', 'notes', 'Комментарий']
-            }
-            
-            # Получение значений
-            customer_name = self._get_value_from_row(row, column_mapping['ФИО_клиента'], '')
-            if not customer_name:
-                self.logger.warning(f"Пропускаю заказ {order_index}: не указан клиент")
-                return None
-            
-            # Поиск клиента
-            customer = self._find_customer_by_name(customer_name)
+        mapping = self.ORDER_COLUMN_MAPPING
+        customer_names = self._get_column(df, mapping['customer_name'], '')
+        has_customer = customer_names.astype(bool)
+        self._parse_warnings['no_customer'] += int((~has_customer).sum())
+        df = df[has_customer]
+        # Числовые ячейки имени приводятся к строке один раз: и ключ поиска,
+        # и имя нового клиента должны быть строками для индексов приложения
+        customer_names = customer_names[has_customer].astype(str)
+        
+        # Клиент ищется один раз на каждое имя; новые клиенты создаются
+        # в порядке первого появления имени, как при построчной обработке.
+        # Индексы приложения перестраиваются один раз после добавления всех новых клиентов
+        customers_by_name = {}
+        new_customers = False
+        for customer_name in customer_names.unique():
+            clean_name = customer_name.strip().lower()
+            if clean_name in customers_by_name:
+                continue
+            customer = self._find_customer_by_name(clean_name)
             if not customer:
-                self.logger.warning(f"Клиент не найден: {customer_name}")
-                # Создаем нового клиента
+                self._parse_warnings['new_customer'] += 1
                 customer = self._create_new_customer(customer_name)
-                if customer:
-                    self.main_app.customers.append(customer)
-                    self.main_app.next_customer_id += 1
-            
-            if not customer:
-                return None
-            
-            # Расчет цен
-            quantity = self._parse_int(self._get_value_from_row(row, column_mapping['Количество'], 1))
-            price = self._parse_float(self._get_value_from_row(row, column_mapping['Цена_за_шт'], 0))
-            discount = self._parse_float(self._get_value_from_row(row, column_mapping['Скидка_%'], 0))
-            
-            final_price = price * (1 - discount / 100)
-            total_amount = final_price * quantity
-            
-            # Формирование данных заказа
-            order_data = {
-                'id': self._get_value_from_row(row, column_mapping['ID_заказа'], f"ORD{order_index:05d}"),
-                'customer_id': customer['id'],
-                'customer_name': customer_name,
-                'date': self._parse_date(
-                    self._get_value_from_row(row, column_mapping['Дата_заказа'], datetime.now())
-                ),
-                'book_title': self._get_value_from_row(row, column_mapping['Название_книги'], ''),
-                'author': self._get_value_from_row(row, column_mapping['Автор'], ''),
-                'genre': self._get_value_from_row(row, column_mapping['Жанр'], ''),
-                'quantity': quantity,
-                'price': price,
-                'discount': discount,
-                'final_price': final_price,
-                'total_amount': total_amount,
-                'status': self._get_value_from_row(row, column_mapping['Статус_заказа'], 'Ожидает оплаты'),
-                'delivery_method': self._get_value_from_row(row, column_mapping['Способ_доставки'], 'Самовывоз'),
-                'order_notes': self._get_value_from_row(row, column_mapping['Примечание_к_заказу'], '')
-            }
-            
-            return order_data
-            
-        except Exception as e:
-            self.logger.warning(f"Ошибка обработки строки заказа: {e}")
-            return None
+                customer['full_name_ci'] = clean_name
+                self.main_app.customers.append(customer)
+                self.main_app.next_customer_id += 1
+                new_customers = True
+            customers_by_name[clean_name] = customer['id']
+        if new_customers:
+            self.main_app.rebuild_customer_indexes()
+        
+        # Расчет цен
+        quantity = self._parse_number_column(self._get_column(df, mapping['quantity']), 1, 'int')
+        quantity = np.trunc(quantity).astype(int)
+        price = self._parse_number_column(self._get_column(df, mapping['price']), 0.0, 'float')
+        discount = self._parse_number_column(self._get_column(df, mapping['discount']), 0.0, 'float')
+        final_price = price * (1 - discount / 100)
+        
+        default_ids = pd.Series([f"ORD{order_id_start + index:05d}" for index in df.index], index=df.index)
+        orders = pd.DataFrame({
+            'id': self._get_column(df, mapping['id']).fillna(default_ids),
+            'customer_id': customer_names.map(lambda name: customers_by_name[name.strip().lower()]),
+            'customer_name': customer_names,
+            'date': self._parse_date_column(self._get_column(df, mapping['date'])),
+            'book_title': self._get_column(df, mapping['book_title'], ''),
+            'author': self._get_column(df, mapping['author'], ''),
+            'genre': self._get_column(df, mapping['genre'], ''),
+            'quantity': quantity,
+            'price': price,
+            'discount': discount,
+            'final_price': final_price,
+            'total_amount': final_price * quantity,
+            'status': self._get_column(df, mapping['status'], 'Ожидает оплаты'),
+            'delivery_method': self._get_column(df, mapping['delivery_method'], 'Самовывоз'),
+            'order_notes': self._get_column(df, mapping['order_notes'], '')
+        }, index=df.index)
+        return orders.to_dict('records')
     
     def _create_new_customer(self, customer_name):
         """Создание нового клиента при импорте"""
@@ -754,164 +1035,201 @@ class ExcelDataImporter:
             'full_name': customer_name,
             'email': '',
             'phone': '',
-            'registration_date': datetime.now().strftime("%Y-%m-%d"),
+            'registration_date': today_iso(),
             'notes': 'Создан автоматически при импорте заказов',
             'total_orders': 0,
             'total_spent': 0.0
         }
         return customer
     
-    def _get_value_from_row(self, row, possible_columns, default=None):
+    def _get_column(self, df, possible_columns, default=None):
         """
-        Получение значения из строки по различным возможным названиям колонок
+        Получение колонки по первому из возможных названий
         
         Args:
-            row: Строка DataFrame
+            df (pd.DataFrame): Прочитанный лист Excel
             possible_columns: Список возможных названий колонок
-            default: Значение по умолчанию
+            default: Значение вместо пропусков (None оставляет пропуски)
         
         Returns:
-            Любое: Значение из строки
+            pd.Series: Значения колонки с типом object
         """
         for col in possible_columns:
-            if col in row.index:
-                value = row[col]
-                if pd.isna(value):
-                    return default
-                return value
-        return default
-    
-    def _find_customer_by_name(self, name):
+            if col in df.columns:
+                values = df[col].astype(object)
+                break
+        else:
+            values = pd.Series(None, index=df.index, dtype=object)
+        
+        if default is None:
+            return values
+        return values.where(values.notna(), default)
+    
+    def _find_customer_by_name(self, clean_name):
         """
         Поиск клиента по имени
         
         Args:
-            name (str): Имя клиента
+            clean_name (str): Имя клиента без пробелов по краям в нижнем регистре
         
         Returns:
             dict: Данные клиента или None
         """
-        clean_name = str(name).strip().lower()
-        for customer in self.main_app.customers:
-            if customer['full_name'].lower() == clean_name:
-                return customer
+        # Точное совпадение берется из индекса приложения; клиенты, созданные
+        # текущим импортом, в него еще не попали и находятся по имени в _process_order_frame
+        customer = self.main_app.find_customer_by_name(clean_name)
+        if customer:
+            return customer
         
         # Попробуем найти частичное совпадение
-        for customer in self.main_app.customers:
-            if clean_name in customer['full_name'].lower():
-                return customer
-        
-        return None
-    
-    def _parse_date(self, value):
-        """
-        Парсинг даты из различных форматов
-        
-        Args:
-            value: Значение даты
-        
-        Returns:
-            str: Дата в формате YYYY-MM-DD
-        """
-        if pd.isna(value):
-            return datetime.now().strftime("%Y-%m-%d")
-        
-        if isinstance(value, datetime):
-            return value.strftime("%Y-%m-%d")
-        
-        if isinstance(value, str):
-            # Попробуем разные форматы
-            date_formats = [
-                "%Y-%m-%d",
-                "%d.%m.%Y",
-                "%d/%m/%Y",
-                "%m/%d/%Y",
-                "%Y.%m.%d",
-                "%d-%m-%Y",
-                "%Y/%m/%d"
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    date_obj = datetime.strptime(value.strip(), fmt)
-                    return date_obj.strftime("%Y-%m-%d")
-                except ValueError:
-                    continue
-        
-        # Если не удалось распарсить, возвращаем сегодняшнюю дату
-        return datetime.now().strftime("%Y-%m-%d")
+        return self.main_app.find_customer_by_name_part(clean_name)
     
-    def _parse_int(self, value):
+    def _parse_date_column(self, values):
         """
-        Парсинг целого числа
+        Векторизованный парсинг колонки дат из различных форматов
         
         Args:
-            value: Значение
+            values (pd.Series): Значения дат (даты, строки или пропуски)
         
         Returns:
-            int: Целое число
+            pd.Series: Даты в формате YYYY-MM-DD, вместо пропусков и ошибок сегодняшняя дата
         """
-        if pd.isna(value):
-            return 1
-        
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return 1
-    
-    def _parse_float(self, value):
+        is_datetime = values.map(lambda value: isinstance(value, datetime))
+        parsed = pd.to_datetime(values.where(is_datetime), errors='coerce')
+        
+        # Строки разбираются по форматам, каждый формат получает только еще не распознанные
+        strings = values.map(lambda value: value.strip() if isinstance(value, str) else None)
+        for fmt in self.IMPORT_DATE_FORMATS:
+            pending = strings.notna() & parsed.isna()
+            if not pending.any():
+                break
+            parsed[pending] = pd.to_datetime(strings[pending], format=fmt, errors='coerce')
+        
+        result = parsed.dt.strftime("%Y-%m-%d")
+        self._parse_warnings['date'] += int((result.isna() & values.notna()).sum())
+        return result.fillna(today_iso()).astype(object)
+    
+    def _parse_number_column(self, values, default, warning_key):
         """
-        Парсинг дробного числа
+        Векторизованный парсинг числовой колонки
         
         Args:
-            value: Значение
+            values (pd.Series): Исходные значения
+            default: Значение вместо пропусков и ошибок
+            warning_key (str): Ключ счетчика нераспознанных значений
         
         Returns:
-            float: Дробное число
+            pd.Series: Числа с типом float
         """
-        if pd.isna(value):
-            return 0.0
+        numbers = pd.to_numeric(values, errors='coerce').astype(float)
+        numbers = numbers.where(np.isfinite(numbers))
+        self._parse_warnings[warning_key] += int((numbers.isna() & values.notna()).sum())
+        return numbers.fillna(default)
+    
+    def _log_parse_warnings(self):
+        """Вывод одной сводки проблем, накопленных при обработке строк"""
+        # Унарный плюс отбрасывает нулевые счетчики векторизованных проверок
+        warnings = +self._parse_warnings
+        if not warnings:
+            return
         
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
+        descriptions = {
+            'no_customer': "заказов без клиента пропущено",
+            'new_customer': "клиентов не найдено и создано автоматически",
+            'date': "дат не распознано",
+            'int': "целых чисел не распознано",
+            'float': "дробных чисел не распознано"
+        }
+        summary = ", ".join(f"{count} {descriptions[key]}" for key, count in warnings.items())
+        self.logger.warning(f"Проблемы при импорте: {summary}")
     
     def import_all_data(self):
         """
         Импорт всех данных из Excel файлов
         """
+        if self.main_app.is_data_locked():
+            return
         try:
-            customers_added = 0
-            orders_added = 0
-            
-            # Импорт клиентов
             customers_file = filedialog.askopenfilename(
                 title="Выберите Excel файл с клиентами",
                 filetypes=[("Excel files", "*.xlsx *.xls")]
             )
-            
-            if customers_file:
-                customers = self.import_customers_from_excel(customers_file)
-                if customers:
-                    self.main_app.customers.extend(customers)
-                    self.main_app.next_customer_id += len(customers)
-                    customers_added = len(customers)
-                    self.logger.info(f"Добавлено {customers_added} клиентов")
-            
-            # Импорт заказов
             orders_file = filedialog.askopenfilename(
                 title="Выберите Excel файл с заказами",
                 filetypes=[("Excel files", "*.xlsx *.xls")]
             )
             
-            if orders_file:
-                orders = self.import_orders_from_excel(orders_file)
-                if orders:
-                    self.main_app.orders.extend(orders)
-                    self.main_app.next_order_id += len(orders)
-                    orders_added = len(orders)
-                    self.logger.info(f"Добавлено {orders_added} заказов")
+            # Файлы читаются в фоновом потоке, чтобы интерфейс не замирал на время чтения;
+            # разбор и добавление данных выполняются в главном потоке
+            self.main_app.run_in_background(
+                lambda: self._read_import_files(customers_file, orders_file),
+                self._finish_import_all
+            )
+                
+        except Exception as e:
+            self.logger.error(f"Ошибка при импорте всех данных: {e}")
+            messagebox.showerror("Ошибка", f"Не удалось импортировать данные:\n{str(e)}")
+    
+    def _read_import_files(self, customers_file, orders_file):
+        """
+        Чтение файлов клиентов и заказов в фоновом потоке
+        
+        Returns:
+            list: Пары (таблица, ошибка) для каждого файла; для невыбранного файла (None, None)
+        """
+        results = []
+        for file_path, kind in ((customers_file, "клиентов"), (orders_file, "заказов")):
+            if not file_path:
+                results.append((None, None))
+                continue
+            try:
+                results.append((self._read_import_file(file_path, kind), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+    
+    def _finish_import_all(self, results, error):
+        """Добавление прочитанных клиентов и заказов в приложение (в главном потоке)"""
+        try:
+            if error:
+                raise error
+            (customers_df, customers_error), (orders_df, orders_error) = results
+            customers_added = 0
+            orders_added = 0
+            
+            # Импорт клиентов
+            customers = None
+            if customers_df is not None:
+                try:
+                    customers = self._import_customers_frame(customers_df)
+                except Exception as e:
+                    customers_error = e
+            if customers_error:
+                self.logger.error(f"Ошибка импорта клиентов: {customers_error}")
+                messagebox.showerror("Ошибка импорта", f"Не удалось импортировать клиентов:\n{str(customers_error)}")
+            elif customers:
+                self.main_app.customers.extend(customers)
+                self.main_app.rebuild_customer_indexes()
+                self.main_app.next_customer_id += len(customers)
+                customers_added = len(customers)
+                self.logger.info(f"Добавлено {customers_added} клиентов")
+            
+            # Импорт заказов: клиенты уже добавлены, новые имена сопоставляются с ними
+            orders = None
+            if orders_df is not None:
+                try:
+                    orders = self._import_orders_frame(orders_df)
+                except Exception as e:
+                    orders_error = e
+            if orders_error:
+                self.logger.error(f"Ошибка импорта заказов: {orders_error}")
+                messagebox.showerror("Ошибка импорта", f"Не удалось импортировать заказы:\n{str(orders_error)}")
+            elif orders:
+                self.main_app.orders.extend(orders)
+                self.main_app.rebuild_order_indexes()
+                self.main_app.next_order_id += len(orders)
+                orders_added = len(orders)
+                self.logger.info(f"Добавлено {orders_added} заказов")
             
             # Обновление интерфейса
             if customers_added > 0 or orders_added > 0:
@@ -942,9 +1260,18 @@ class DataVisualization:
         self.metabase_config = None
         self.setup_metabase()
         
-        # Цветовая схема для графиков
-        self.color_palette = sns.color_palette("husl", 8)
-        plt.style.use('seaborn-v0_8-darkgrid')
+        # Цветовая схема для графиков, задается при первой загрузке matplotlib
+        self.color_palette = None
+    
+    def _pyplot(self):
+        """Ленивая загрузка matplotlib и seaborn при построении первого графика"""
+        import matplotlib.pyplot as plt
+        
+        if self.color_palette is None:
+            import seaborn as sns
+            self.color_palette = sns.color_palette("husl", 8)
+            plt.style.use('seaborn-v0_8-darkgrid')
+        return plt
     
     def setup_metabase(self):
         """Настройка подключения к Metabase"""
@@ -952,8 +1279,7 @@ class DataVisualization:
             # Пытаемся загрузить конфигурацию из файла
             config_file = "metabase_config.json"
             if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    self.metabase_config = json.load(f)
+                self.metabase_config = load_json_file(config_file)
                 self.logger.info("Конфигурация Metabase загружена")
             else:
                 # Создаем шаблон конфигурации
@@ -1039,7 +1365,7 @@ class DataVisualization:
         """Создание графика динамики выручки"""
         try:
             # Создание простого графика для демонстрации
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._pyplot().subplots(figsize=(10, 6))
             ax.plot([1, 2, 3, 4, 5], [100, 200, 150, 300, 250], marker='o')
             ax.set_xlabel('Месяцы')
             ax.set_ylabel('Выручка, руб.')
@@ -1062,6 +1388,8 @@ class DataVisualization:
     
     def display_chart(self, figure):
         """Отображение графика в интерфейсе"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
         if self.chart_canvas:
             self.chart_canvas.get_tk_widget().destroy()
         
@@ -1106,12 +1434,6 @@ class DataVisualization:
         period_frame = ttk.Frame(control_frame)
         period_frame.grid(row=1, column=0, columnspan=len(viz_types)+1, sticky=tk.W, pady=5)
         
-        self.chart_frame = ttk.LabelFrame(main_frame, text="Визуализация", padding="10")
-        self.chart_frame.pack(fill=tk.BOTH, expand=True)
-        
-        self.chart_canvas = None
-        self.current_figure = None
-
         ttk.Label(period_frame, text="Период:").pack(side=tk.LEFT, padx=5)
         
         self.period_var = tk.StringVar(value="month")
@@ -1137,8 +1459,8 @@ class DataVisualization:
                       command=self.open_metabase).pack(side=tk.LEFT, padx=5)
         
         # Область для графика
-        chart_frame = ttk.LabelFrame(main_frame, text="Визуализация", padding="10")
-        chart_frame.pack(fill=tk.BOTH, expand=True)
+        self.chart_frame = ttk.LabelFrame(main_frame, text="Визуализация", padding="10")
+        self.chart_frame.pack(fill=tk.BOTH, expand=True)
         
         self.chart_canvas = None
         self.current_figure = None
@@ -1153,12 +1475,7 @@ class DataVisualization:
         
         self.stats_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         stats_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Кнопка настройки Metabase
-        if self.metabase_config.get("enabled"):
-            ttk.Button(button_frame, text="Открыть в Metabase", 
-                      command=self.open_metabase).pack(side=tk.LEFT, padx=5)
-            
+
 
 class CustomerDialog:
     """Диалог для работы с клиентами"""
@@ -1197,7 +1514,6 @@ class CustomerDialog:
         
         ttk.Label(main_frame, text="Дата регистрации:").grid(row=4, column=0, sticky=tk.W, pady=5)
         self.reg_date_entry = ttk.Entry(main_frame, width=40)
-        self.reg_date_entry.insert(0, date.today().strftime("%Y-%m-%d"))
         self.reg_date_entry.grid(row=4, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Примечания:").grid(row=5, column=0, sticky=tk.NW, pady=5)
@@ -1215,13 +1531,17 @@ class CustomerDialog:
     
     def fill_form(self):
         """Заполнение формы данными"""
-        if self.customer_data:
-            self.name_entry.insert(0, self.customer_data.get('full_name', ''))
-            self.email_entry.insert(0, self.customer_data.get('email', ''))
-            self.phone_entry.insert(0, self.customer_data.get('phone', ''))
-            self.reg_date_entry.delete(0, tk.END)
-            self.reg_date_entry.insert(0, self.customer_data.get('registration_date', date.today().strftime("%Y-%m-%d")))
-            self.notes_text.insert('1.0', self.customer_data.get('notes', ''))
+        # Поля только что созданы и пусты: каждое заполняется одним вызовом Tcl,
+        # пустые значения пропускаются; без даты в данных подставляется сегодняшняя
+        data = {'registration_date': today_iso(), **self.customer_data}
+        for field, key in ((self.name_entry, 'full_name'), (self.email_entry, 'email'),
+                           (self.phone_entry, 'phone'), (self.reg_date_entry, 'registration_date')):
+            value = data.get(key, '')
+            if value != '':
+                field.insert(0, value)
+        notes = data.get('notes', '')
+        if notes != '':
+            self.notes_text.insert('1.0', notes)
     
     def validate_form(self):
         """Валидация формы"""
@@ -1231,9 +1551,7 @@ class CustomerDialog:
             return False
         
         reg_date = self.reg_date_entry.get().strip()
-        try:
-            datetime.strptime(reg_date, "%Y-%m-%d")
-        except ValueError:
+        if not is_iso_date(reg_date):
             messagebox.showerror("Ошибка", "Неверный формат даты. Используйте ГГГГ-ММ-ДД")
             return False
         
@@ -1247,7 +1565,7 @@ class CustomerDialog:
                 'email': self.email_entry.get().strip(),
                 'phone': self.phone_entry.get().strip(),
                 'registration_date': self.reg_date_entry.get().strip(),
-                'notes': self.notes_text.get('1.0', tk.END).strip()
+                'notes': self.notes_text.get('1.0', 'end-1c')
             }
             self.dialog.destroy()
     
@@ -1259,15 +1577,53 @@ class CustomerDialog:
 class OrderDialog:
     """Диалог для работы с заказами"""
     
+    # Все атрибуты экземпляра перечислены заранее, __dict__ не создается
+    __slots__ = (
+        'parent', 'customer', 'order_data', 'result', '_parsed', 'dialog',
+        'date_entry', 'book_title_entry', 'author_entry', 'genre_entry',
+        'quantity_entry', 'price_entry', 'discount_entry', 'status_combo',
+        'delivery_combo', 'notes_text', 'error_label', '_fields', '_vars'
+    )
+    
+    # Обязательные поля формы: (название поля, ключ заказа)
+    REQUIRED_FIELDS = (
+        ('Дата заказа', 'date'),
+        ('Название книги', 'book_title'),
+        ('Количество', 'quantity'),
+        ('Цена за шт', 'price')
+    )
+    
+    # Числовые поля формы: (ключ заказа, преобразование, проверка значения, сообщение об ошибке)
+    NUMERIC_FIELDS = (
+        ('quantity', int, lambda value: value > 0, "Количество должно быть положительным"),
+        ('price', float, lambda value: value >= 0, "Цена не может быть отрицательной"),
+        ('discount', parse_number, lambda value: 0 <= value <= 100, "Скидка должна быть от 0 до 100%")
+    )
+    # int() и float() сами пропускают пробелы вокруг числа, поэтому эти поля не очищаются
+    NUMERIC_KEYS = frozenset(field[0] for field in NUMERIC_FIELDS)
+    
+    # Ключи заказа в порядке полей формы (self._fields), примечание последнее
+    RESULT_KEYS = ('date', 'book_title', 'author', 'genre', 'quantity', 'price',
+                   'discount', 'status', 'delivery_method', 'order_notes')
+    # Значения полей для нового заказа (дата подставляется при заполнении формы)
+    FIELD_DEFAULTS = {
+        'book_title': '', 'author': '', 'genre': '', 'quantity': 1, 'price': '',
+        'discount': 0, 'status': 'Ожидает оплаты', 'delivery_method': 'Самовывоз',
+        'order_notes': ''
+    }
+    # Извлечение значений заказа в порядке RESULT_KEYS одним вызовом
+    get_field_values = itemgetter(*RESULT_KEYS)
+    
     def __init__(self, parent, title, customer, order_data=None):
         self.parent = parent
         self.customer = customer
         self.order_data = order_data or {}
         self.result = None
+        self._parsed = None
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(f"{title} - {customer['full_name']}")
-        self.dialog.geometry("500x450")
+        self.dialog.geometry("500x520")
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
@@ -1282,54 +1638,55 @@ class OrderDialog:
         ttk.Label(main_frame, text=f"Клиент: {self.customer['full_name']}", 
                  font=('Arial', 10, 'bold')).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
         
+        # Значения полей ввода и списков хранятся в переменных Tk, примечание читается из Text
+        self._vars = {key: tk.StringVar(self.dialog) for key in self.RESULT_KEYS if key != 'order_notes'}
+        
         # Поля формы
         ttk.Label(main_frame, text="Дата заказа:*").grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.date_entry = ttk.Entry(main_frame, width=25)
-        self.date_entry.insert(0, date.today().strftime("%Y-%m-%d"))
+        self.date_entry = ttk.Entry(main_frame, width=25, textvariable=self._vars['date'])
         self.date_entry.grid(row=1, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Название книги:*").grid(row=2, column=0, sticky=tk.W, pady=5)
-        self.book_title_entry = ttk.Entry(main_frame, width=25)
+        self.book_title_entry = ttk.Entry(main_frame, width=25, textvariable=self._vars['book_title'])
         self.book_title_entry.grid(row=2, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Автор:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        self.author_entry = ttk.Entry(main_frame, width=25)
+        self.author_entry = ttk.Entry(main_frame, width=25, textvariable=self._vars['author'])
         self.author_entry.grid(row=3, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Жанр:").grid(row=4, column=0, sticky=tk.W, pady=5)
-        self.genre_entry = ttk.Entry(main_frame, width=25)
+        self.genre_entry = ttk.Entry(main_frame, width=25, textvariable=self._vars['genre'])
         self.genre_entry.grid(row=4, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Количество:*").grid(row=5, column=0, sticky=tk.W, pady=5)
-        self.quantity_entry = ttk.Entry(main_frame, width=25)
-        self.quantity_entry.insert(0, "1")
+        self.quantity_entry = ttk.Entry(main_frame, width=25, textvariable=self._vars['quantity'])
         self.quantity_entry.grid(row=5, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Цена за шт:*").grid(row=6, column=0, sticky=tk.W, pady=5)
-        self.price_entry = ttk.Entry(main_frame, width=25)
+        self.price_entry = ttk.Entry(main_frame, width=25, textvariable=self._vars['price'])
         self.price_entry.grid(row=6, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Скидка %:").grid(row=7, column=0, sticky=tk.W, pady=5)
-        self.discount_entry = ttk.Entry(main_frame, width=25)
-        self.discount_entry.insert(0, "0")
+        self.discount_entry = ttk.Entry(main_frame, width=25, textvariable=self._vars['discount'])
         self.discount_entry.grid(row=7, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Статус:").grid(row=8, column=0, sticky=tk.W, pady=5)
-        self.status_combo = ttk.Combobox(main_frame, width=22, 
+        self.status_combo = ttk.Combobox(main_frame, width=22, textvariable=self._vars['status'],
                                        values=["Ожидает оплаты", "Оплачен", "В обработке", "Отправлен", "Завершен", "Отменен"])
-        self.status_combo.set("Ожидает оплаты")
         self.status_combo.grid(row=8, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Способ доставки:").grid(row=9, column=0, sticky=tk.W, pady=5)
-        self.delivery_combo = ttk.Combobox(main_frame, width=22,
+        self.delivery_combo = ttk.Combobox(main_frame, width=22, textvariable=self._vars['delivery_method'],
                                          values=["Самовывоз", "Курьер", "Почта России", "СДЭК"])
-        self.delivery_combo.set("Самовывоз")
         self.delivery_combo.grid(row=9, column=1, sticky=tk.W, pady=5, padx=10)
         
         ttk.Label(main_frame, text="Примечание к заказу:").grid(row=10, column=0, sticky=tk.NW, pady=5)
         self.notes_text = tk.Text(main_frame, width=25, height=3)
         self.notes_text.grid(row=10, column=1, sticky=tk.W, pady=5, padx=10)
         
+        # Поля формы в порядке RESULT_KEYS: переменные Tk и виджет Text примечания
+        self._fields = tuple(self._vars[key] for key in self.RESULT_KEYS[:-1]) + (self.notes_text,)
+        
         # Кнопки
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=11, column=0, columnspan=2, pady=20)
@@ -1338,84 +1695,81 @@ class OrderDialog:
                   command=self.save).pack(side=tk.LEFT, padx=10)
         ttk.Button(button_frame, text="Отмена", 
                   command=self.cancel).pack(side=tk.LEFT, padx=10)
+        
+        # Ошибки валидации показываются в форме, без отдельного окна
+        self.error_label = ttk.Label(main_frame, foreground='red', wraplength=440, justify=tk.LEFT)
+        self.error_label.grid(row=12, column=0, columnspan=2, sticky=tk.W)
     
     def fill_form(self):
-        """Заполнение формы данными"""
-        if self.order_data:
-            self.date_entry.delete(0, tk.END)
-            self.date_entry.insert(0, self.order_data.get('date', date.today().strftime("%Y-%m-%d")))
-            self.book_title_entry.insert(0, self.order_data.get('book_title', ''))
-            self.author_entry.insert(0, self.order_data.get('author', ''))
-            self.genre_entry.insert(0, self.order_data.get('genre', ''))
-            self.quantity_entry.delete(0, tk.END)
-            self.quantity_entry.insert(0, str(self.order_data.get('quantity', 1)))
-            self.price_entry.delete(0, tk.END)
-            self.price_entry.insert(0, str(self.order_data.get('price', 0)))
-            self.discount_entry.delete(0, tk.END)
-            self.discount_entry.insert(0, str(self.order_data.get('discount', 0)))
-            self.status_combo.set(self.order_data.get('status', 'Ожидает оплаты'))
-            self.delivery_combo.set(self.order_data.get('delivery_method', 'Самовывоз'))
-            self.notes_text.insert('1.0', self.order_data.get('order_notes', ''))
+        """Заполнение формы данными заказа или значениями по умолчанию"""
+        values = self.get_field_values({**self.FIELD_DEFAULTS, 'date': today_iso(), **self.order_data})
+        for field, value in zip(self._fields, values):
+            self._set_field(field, str(value))
+    
+    def _set_field(self, field, value):
+        """Запись значения в поле формы"""
+        if isinstance(field, tk.Text):
+            # replace заменяет содержимое одним вызовом Tcl вместо delete и insert
+            field.replace('1.0', tk.END, value)
+        else:
+            field.set(value)
+    
+    def _read_field(self, field):
+        """Чтение значения поля формы"""
+        if isinstance(field, tk.Text):
+            # 'end-1c' отсекает завершающий перевод строки Text без лишней копии строки
+            return field.get('1.0', 'end-1c')
+        return field.get()
     
     def validate_form(self):
         """Валидация формы"""
-        # Проверка обязательных полей
-        required_fields = {
-            'Дата заказа': self.date_entry.get().strip(),
-            'Название книги': self.book_title_entry.get().strip(),
-            'Количество': self.quantity_entry.get().strip(),
-            'Цена за шт': self.price_entry.get().strip()
-        }
-        
-        for field_name, value in required_fields.items():
-            if not value:
-                messagebox.showerror("Ошибка", f"{field_name} обязательно для заполнения!")
-                return False
-        
-        # Валидация даты
-        try:
-            datetime.strptime(self.date_entry.get().strip(), "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Ошибка", "Неверный формат даты. Используйте ГГГГ-ММ-ДД")
-            return False
+        # Каждое поле читается один раз, разобранные значения затем использует save()
+        values = dict(zip(self.RESULT_KEYS, [self._read_field(field) for field in self._fields]))
+        for key, value in values.items():
+            if key not in self.NUMERIC_KEYS and key != 'order_notes':
+                values[key] = value.strip()
+        # Все ошибки собираются и показываются одним сообщением
+        errors = []
         
-        # Валидация числовых полей
-        try:
-            quantity = int(self.quantity_entry.get().strip())
-            price = float(self.price_entry.get().strip())
-            discount = float(self.discount_entry.get().strip())
+        # Проверка обязательных полей
+        for field_name, key in self.REQUIRED_FIELDS:
+            if not values[key]:
+                errors.append(f"{field_name} обязательно для заполнения!")
+        
+        # Валидация даты (о пустой дате уже сообщено выше)
+        if values['date'] and not is_iso_date(values['date']):
+            errors.append("Неверный формат даты. Используйте ГГГГ-ММ-ДД")
+        
+        # Валидация числовых полей, если обязательные из них заполнены
+        if values['quantity'] and values['price']:
+            numbers = None
+            # Строки сначала проверяются регулярным выражением, исключение остается страховкой
+            if all(NUMBER_RE.match(values[key]) for key, _, _, _ in self.NUMERIC_FIELDS):
+                try:
+                    numbers = {key: convert(values[key]) for key, convert, _, _ in self.NUMERIC_FIELDS}
+                except ValueError:
+                    pass
             
-            if quantity <= 0:
-                messagebox.showerror("Ошибка", "Количество должно быть положительным")
-                return False
-            if price < 0:
-                messagebox.showerror("Ошибка", "Цена не может быть отрицательной")
-                return False
-            if discount < 0 or discount > 100:
-                messagebox.showerror("Ошибка", "Скидка должна быть от 0 до 100%")
-                return False
-                
-        except ValueError:
-            messagebox.showerror("Ошибка", "Количество, цена и скидка должны быть числами")
+            if numbers is None:
+                errors.append("Количество, цена и скидка должны быть числами")
+            else:
+                for key, _, is_valid, message in self.NUMERIC_FIELDS:
+                    if not is_valid(numbers[key]):
+                        errors.append(message)
+                values.update(numbers)
+        
+        # Ошибки заменяют текст метки целиком, успешная проверка его очищает
+        self.error_label.configure(text="\n".join(errors))
+        if errors:
             return False
         
+        self._parsed = values
         return True
     
     def save(self):
         """Сохранение данных"""
         if self.validate_form():
-            self.result = {
-                'date': self.date_entry.get().strip(),
-                'book_title': self.book_title_entry.get().strip(),
-                'author': self.author_entry.get().strip(),
-                'genre': self.genre_entry.get().strip(),
-                'quantity': int(self.quantity_entry.get().strip()),
-                'price': float(self.price_entry.get().strip()),
-                'discount': float(self.discount_entry.get().strip()),
-                'status': self.status_combo.get(),
-                'delivery_method': self.delivery_combo.get(),
-                'order_notes': self.notes_text.get('1.0', tk.END).strip()
-            }
+            self.result = self._parsed
             self.dialog.destroy()
     
     def cancel(self):
@@ -1439,11 +1793,26 @@ class CustomerManagementSystem:
         self.excel_importer = ExcelDataImporter(self)
         self.data_viz = DataVisualization(self)
         
+        # Потоки для сетевых запросов и записи файлов, не блокирующих интерфейс
+        self._background = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cms-background')
+        
         # Инициализация Metabase
         self.metabase_config = self.load_metabase_config()
         self.metabase_integration = None
         self.setup_metabase_integration()
         
+        # Строки списка клиентов на вкладке заказов и обратный индекс ID -> строка
+        self._customer_listbox_rows = []
+        self._customer_listbox_index = {}
+        # Значения строк, показанных в таблице заказов, по iid
+        self._order_tree_rows = {}
+        self._order_tree_customer_id = None
+        self._order_tree_limit = ORDER_TREE_PAGE_SIZE
+        # Отложенное обновление таблицы клиентов после изменения заказов
+        self._customers_refresh_pending = False
+        # Идет фоновая загрузка из CSV: ее результат заменит данные, поэтому изменения блокируются
+        self._csv_loading = False
+        
         self.setup_database()
         self.create_widgets()
         
@@ -1455,8 +1824,7 @@ class CustomerManagementSystem:
         try:
             config_file = "metabase_config.json"
             if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config = load_json_file(config_file)
                 logging.info("Конфигурация Metabase загружена из файла")
                 return config
             else:
@@ -1483,22 +1851,28 @@ class CustomerManagementSystem:
             if self.metabase_config.get("enabled", False):
                 self.metabase_integration = MetabaseIntegration(self.metabase_config)
                 
-                # Пробуем подключиться
-                if self.metabase_integration.connect():
-                    logging.info("Интеграция с Metabase успешно настроена")
-                else:
-                    logging.warning("Не удалось подключиться к Metabase")
-                    self.metabase_integration = None
+                # Подключение идет в фоне, окно открывается не дожидаясь ответа Metabase
+                self.run_in_background(self.metabase_integration.connect, self._finish_metabase_setup)
         except Exception as e:
             logging.error(f"Ошибка настройки интеграции с Metabase: {e}")
             self.metabase_integration = None
     
+    def _finish_metabase_setup(self, connected, error):
+        """Результат фонового подключения к Metabase"""
+        if connected:
+            logging.info("Интеграция с Metabase успешно настроена")
+        else:
+            logging.warning(f"Не удалось подключиться к Metabase{f': {error}' if error else ''}")
+            self.metabase_integration = None
+    
     def setup_database(self):
         """Настройка базы данных"""
         self.customers = []
         self.orders = []
         self.next_customer_id = 1
         self.next_order_id = 1
+        self.rebuild_customer_indexes()
+        self.rebuild_order_indexes()
         
         # Инициализация менеджера БД
         self.db_manager = DatabaseManager()
@@ -1565,10 +1939,11 @@ class CustomerManagementSystem:
         ttk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT, padx=(0, 5))
         self.search_entry = ttk.Entry(search_frame, width=20)
         self.search_entry.pack(side=tk.LEFT, padx=5)
-        self.search_entry.bind('<KeyRelease>', lambda e: self.search_customers())
+        self._search_after_id = None
+        self.search_entry.bind('<KeyRelease>', self.schedule_search)
         
         # Кнопка синхронизации с БД
-        if self.db_manager.connection:
+        if self.db_manager.pool:
             ttk.Button(btn_frame, text="💾 Сохранить в БД", 
                       command=self.save_to_database).pack(side=tk.LEFT, padx=2)
             ttk.Button(btn_frame, text="📥 Загрузить из БД", 
@@ -1579,7 +1954,9 @@ class CustomerManagementSystem:
     
     def save_to_database(self):
         """Сохранение данных в PostgreSQL"""
-        if not self.db_manager.connection:
+        if self.is_data_locked():
+            return
+        if not self.db_manager.pool:
             messagebox.showwarning("База данных", "Нет подключения к PostgreSQL")
             return
         
@@ -1592,15 +1969,13 @@ class CustomerManagementSystem:
                     self.metabase_config.get("enabled", False) and
                     self.metabase_config.get("auto_sync_on_save", True)):
                     
-                    def sync_after_save():
-                        if self.metabase_integration.sync_schema():
-                            self.update_status("Данные синхронизированы с Metabase")
+                    def log_sync_result(synced, error):
+                        if synced:
+                            logging.info("Данные синхронизированы с Metabase")
                         else:
-                            self.update_status("Ошибка синхронизации с Metabase")
+                            logging.warning(f"Ошибка синхронизации с Metabase: {error or 'нет ответа'}")
                     
-                    import threading
-                    thread = threading.Thread(target=sync_after_save, daemon=True)
-                    thread.start()
+                    self.run_in_background(self.metabase_integration.sync_schema, log_sync_result)
                     
             else:
                 messagebox.showwarning("База данных", "Не удалось сохранить данные в PostgreSQL")
@@ -1609,7 +1984,9 @@ class CustomerManagementSystem:
     
     def load_from_database(self):
         """Загрузка данных из PostgreSQL"""
-        if not self.db_manager.connection:
+        if self.is_data_locked():
+            return
+        if not self.db_manager.pool:
             messagebox.showwarning("База данных", "Нет подключения к PostgreSQL")
             return
         
@@ -1618,6 +1995,8 @@ class CustomerManagementSystem:
             if customers is not None and orders is not None:
                 self.customers = customers
                 self.orders = orders
+                self.rebuild_customer_indexes()
+                self.rebuild_order_indexes()
                 
                 # Обновляем ID счетчики
                 if self.customers:
@@ -1724,9 +2103,8 @@ class CustomerManagementSystem:
             # Переключение на вкладку заказов
             self.notebook.select(1)
             # Выбор клиента в списке
-            customer = self.find_customer_by_id(customer_id)
-            if customer:
-                customer_index = self.customers.index(customer)
+            customer_index = self._customer_listbox_index.get(customer_id)
+            if customer_index is not None:
                 self.customer_listbox.selection_clear(0, tk.END)
                 self.customer_listbox.selection_set(customer_index)
                 self.customer_listbox.see(customer_index)
@@ -1740,9 +2118,8 @@ class CustomerManagementSystem:
             # Переключение на вкладку заказов
             self.notebook.select(1)
             # Выбор клиента в списке
-            customer = self.find_customer_by_id(customer_id)
-            if customer:
-                customer_index = self.customers.index(customer)
+            customer_index = self._customer_listbox_index.get(customer_id)
+            if customer_index is not None:
                 self.customer_listbox.selection_clear(0, tk.END)
                 self.customer_listbox.selection_set(customer_index)
                 self.customer_listbox.see(customer_index)
@@ -1818,6 +2195,11 @@ class CustomerManagementSystem:
         self.orders_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Заказы показываются страницами, следующая добавляется по кнопке
+        self.more_orders_button = ttk.Button(parent, text="Показать еще",
+                                             command=self.show_more_orders, state=tk.DISABLED)
+        self.more_orders_button.pack(anchor=tk.E, pady=(5, 0))
+        
         # Контекстное меню для заказов
         self.orders_context_menu = tk.Menu(self.root, tearoff=0)
         self.orders_context_menu.add_command(label="Редактировать заказ", command=self.edit_selected_order)
@@ -1886,7 +2268,7 @@ class CustomerManagementSystem:
         
         ttk.Label(params_frame, text="Дата по:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
         self.date_to = ttk.Entry(params_frame, width=12)
-        self.date_to.insert(0, date.today().strftime("%Y-%m-%d"))
+        self.date_to.insert(0, today_iso())
         self.date_to.grid(row=0, column=3, sticky=tk.W, padx=5, pady=2)
         
         # Кнопки генерации
@@ -1911,6 +2293,8 @@ class CustomerManagementSystem:
     
     def add_customer(self):
         """Добавление нового клиента"""
+        if self.is_data_locked():
+            return
         dialog = CustomerDialog(self.root, "Добавить клиента")
         self.root.wait_window(dialog.dialog)
         
@@ -1922,6 +2306,7 @@ class CustomerManagementSystem:
             customer_data['total_spent'] = 0.0
             
             self.customers.append(customer_data)
+            self.rebuild_customer_indexes()
             self.load_customers()
             self.update_customer_listbox()
             self.update_data_info()
@@ -1930,6 +2315,8 @@ class CustomerManagementSystem:
     
     def edit_customer(self, customer_id):
         """Редактирование клиента"""
+        if self.is_data_locked():
+            return
         customer = self.find_customer_by_id(customer_id)
         if customer:
             dialog = CustomerDialog(self.root, "Редактировать клиента", customer)
@@ -1937,6 +2324,7 @@ class CustomerManagementSystem:
             
             if dialog.result:
                 customer.update(dialog.result)
+                self.rebuild_customer_indexes()
                 self.load_customers()
                 self.update_customer_listbox()
                 messagebox.showinfo("Успех", "Данные клиента обновлены!")
@@ -1945,12 +2333,14 @@ class CustomerManagementSystem:
     
     def delete_customer(self, customer_id):
         """Удаление клиента"""
+        if self.is_data_locked():
+            return
         customer = self.find_customer_by_id(customer_id)
         if customer:
             customer_name = customer.get('full_name', 'Неизвестно')
             
             # Проверка наличия заказов
-            customer_orders = self.order_manager.get_customer_orders(customer_id, self.orders)
+            customer_orders = self.orders_by_customer.get(customer_id, ())
             if customer_orders:
                 confirm = messagebox.askyesno(
                     "Удаление клиента", 
@@ -1967,9 +2357,16 @@ class CustomerManagementSystem:
                 )
             
             if confirm:
-                # Удаление клиента и его заказов
-                self.customers = [c for c in self.customers if c['id'] != customer_id]
-                self.orders = [o for o in self.orders if o['customer_id'] != customer_id]
+                # Удаление клиента и его заказов через индексы вместо пересборки списков
+                self.customers.remove(customer)
+                self.rebuild_customer_indexes()
+                
+                removed_orders = self.orders_by_customer.pop(customer_id, [])
+                self.total_spent_by_customer.pop(customer_id, None)
+                if removed_orders:
+                    removed_ids = {id(order) for order in removed_orders}
+                    self.orders = [o for o in self.orders if id(o) not in removed_ids]
+                    self.invalidate_orders_frame()
                 
                 self.load_customers()
                 self.update_customer_listbox()
@@ -1980,26 +2377,26 @@ class CustomerManagementSystem:
         else:
             messagebox.showerror("Ошибка", "Клиент не найден!")
     
+    def schedule_search(self, event=None):
+        """Отложенный запуск поиска, чтобы не перестраивать таблицу на каждое нажатие"""
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.search_customers)
+    
     def search_customers(self):
         """Поиск клиентов"""
+        self._search_after_id = None
         query = self.search_entry.get().strip().lower()
         
         if not query:
             self.load_customers()
             return
         
-        filtered_customers = []
-        for customer in self.customers:
-            # Поиск по различным полям
-            search_fields = [
-                customer.get('full_name', ''),
-                customer.get('email', ''),
-                customer.get('phone', ''),
-                customer.get('notes', '')
-            ]
-            
-            if any(query in str(field).lower() for field in search_fields):
-                filtered_customers.append(customer)
+        # Поиск по заранее подготовленным строкам полей в нижнем регистре
+        filtered_customers = [
+            customer for search_blob, customer in self._customer_search_blobs
+            if query in search_blob
+        ]
         
         self.display_customers(filtered_customers)
     
@@ -2008,27 +2405,40 @@ class CustomerManagementSystem:
         self.display_customers(self.customers)
         self.update_customer_listbox()
     
+    def schedule_customers_refresh(self):
+        """Обновление таблицы клиентов один раз при простое, сколько бы заказов ни изменилось"""
+        if not self._customers_refresh_pending:
+            self._customers_refresh_pending = True
+            self.root.after_idle(self._flush_customers_refresh)
+    
+    def _flush_customers_refresh(self):
+        """Перерисовка таблицы клиентов с актуальной статистикой заказов"""
+        self._customers_refresh_pending = False
+        self.display_customers(self.customers)
+    
     def display_customers(self, customers):
         """Отображение клиентов в таблице"""
-        # Очистка таблицы
-        for item in self.customer_tree.get_children():
-            self.customer_tree.delete(item)
+        # Очистка таблицы одним вызовом Tcl
+        self.customer_tree.delete(*self.customer_tree.get_children())
         
-        # Заполнение данными
+        # Подготовка строк до обращения к виджету
+        rows = []
         for customer in customers:
-            customer_orders = self.order_manager.get_customer_orders(customer['id'], self.orders)
-            total_spent = self.order_manager.get_customer_total_spent(customer['id'], self.orders)
-            
-            self.customer_tree.insert('', tk.END, values=(
+            notes = customer.get('notes') or ''
+            rows.append((
                 customer['id'],
                 customer.get('full_name', ''),
                 customer.get('email', ''),
                 customer.get('phone', ''),
                 customer.get('registration_date', ''),
-                len(customer_orders),
-                f"{total_spent:.2f} руб.",
-                customer.get('notes', '')[:50] + '...' if customer.get('notes', '') and len(customer.get('notes', '')) > 50 else customer.get('notes', '')
+                len(self.orders_by_customer.get(customer['id'], ())),
+                f"{self.total_spent_by_customer.get(customer['id'], 0.0):.2f} руб.",
+                notes[:50] + ('...' if len(notes) > 50 else '')
             ))
+        
+        # Заполнение данными
+        for values in rows:
+            self.customer_tree.insert('', tk.END, values=values)
     
     def export_to_csv(self):
         """Экспорт данных в CSV"""
@@ -2044,26 +2454,42 @@ class CustomerManagementSystem:
             )
             
             if file_path:
-                df = pd.DataFrame([{
-                    'ID': c['id'],
-                    'ФИО': c.get('full_name', ''),
-                    'Email': c.get('email', ''),
-                    'Телефон': c.get('phone', ''),
-                    'Дата регистрации': c.get('registration_date', ''),
-                    'Всего заказов': len(self.order_manager.get_customer_orders(c['id'], self.orders)),
-                    'Общая сумма': self.order_manager.get_customer_total_spent(c['id'], self.orders),
-                    'Примечания': c.get('notes', '')
-                } for c in self.customers])
-                
-                df.to_csv(file_path, index=False, encoding='utf-8')
-                messagebox.showinfo("Успех", f"Клиенты экспортированы в:\n{file_path}")
+                # Запись выполняется в фоне по снимку списка клиентов и индексов заказов
+                customers = list(self.customers)
+                orders_by_customer = self.orders_by_customer
+                total_spent_by_customer = self.total_spent_by_customer
+                self.run_export_in_background(
+                    lambda: self._write_customers_csv(file_path, customers, orders_by_customer, total_spent_by_customer),
+                    f"Клиенты экспортированы в:\n{file_path}"
+                )
         
         except Exception as e:
             logging.error(f"Ошибка экспорта: {e}")
             messagebox.showerror("Ошибка", f"Не удалось экспортировать: {e}")
     
+    def _write_customers_csv(self, file_path, customers, orders_by_customer, total_spent_by_customer):
+        """Запись клиентов со статистикой заказов в CSV файл"""
+        # Запись напрямую через csv.writer, без промежуточного DataFrame
+        # (utf-8-sig, чтобы Excel корректно открывал кириллицу; буфер 64 КБ сокращает число системных вызовов)
+        with open(file_path, 'w', newline='', encoding='utf-8-sig', buffering=1 << 16) as f:
+            writer = csv.writer(f)
+            writer.writerow(['ID', 'ФИО', 'Email', 'Телефон', 'Дата регистрации',
+                             'Всего заказов', 'Общая сумма', 'Примечания'])
+            writer.writerows((
+                c['id'],
+                c.get('full_name', ''),
+                c.get('email', ''),
+                c.get('phone', ''),
+                c.get('registration_date', ''),
+                len(orders_by_customer.get(c['id'], ())),
+                total_spent_by_customer.get(c['id'], 0),
+                c.get('notes', '')
+            ) for c in customers)
+    
     def add_order(self):
         """Добавление нового заказа"""
+        if self.is_data_locked():
+            return
         selected_customer = self.get_selected_customer_from_listbox()
         if not selected_customer:
             messagebox.showwarning("Предупреждение", "Сначала выберите клиента!")
@@ -2082,14 +2508,17 @@ class CustomerManagementSystem:
             self.next_order_id += 1
             
             self.orders.append(order_data)
+            self.rebuild_order_indexes()
             self.load_orders_for_customer()
-            self.load_customers()  # Обновляем статистику в таблице клиентов
+            self.schedule_customers_refresh()  # Обновляем статистику в таблице клиентов
             self.update_data_info()
             
             messagebox.showinfo("Успех", "Заказ успешно добавлен!")
     
     def edit_selected_order(self):
         """Редактирование выбранного заказа"""
+        if self.is_data_locked():
+            return
         selected_order = self.get_selected_order()
         if not selected_order:
             messagebox.showwarning("Предупреждение", "Сначала выберите заказ!")
@@ -2103,13 +2532,16 @@ class CustomerManagementSystem:
             selected_order.update(dialog.result)
             selected_order['total_amount'] = selected_order['quantity'] * selected_order['price'] * (1 - selected_order['discount'] / 100)
             selected_order['final_price'] = selected_order['price'] * (1 - selected_order['discount'] / 100)
+            self.rebuild_order_indexes()
             self.load_orders_for_customer()
-            self.load_customers()
+            self.schedule_customers_refresh()
             
             messagebox.showinfo("Успех", "Заказ успешно обновлен!")
     
     def delete_selected_order(self):
         """Удаление выбранного заказа"""
+        if self.is_data_locked():
+            return
         selected_order = self.get_selected_order()
         if not selected_order:
             messagebox.showwarning("Предупреждение", "Сначала выберите заказ!")
@@ -2123,8 +2555,9 @@ class CustomerManagementSystem:
         
         if confirm:
             self.orders = [o for o in self.orders if o['id'] != selected_order['id']]
+            self.rebuild_order_indexes()
             self.load_orders_for_customer()
-            self.load_customers()
+            self.schedule_customers_refresh()
             self.update_data_info()
             
             messagebox.showinfo("Успех", "Заказ успешно удален!")
@@ -2135,15 +2568,52 @@ class CustomerManagementSystem:
         if not selected_customer:
             return
         
-        customer_orders = self.order_manager.get_customer_orders(selected_customer['id'], self.orders)
-        
-        # Очистка таблицы
-        for item in self.orders_tree.get_children():
-            self.orders_tree.delete(item)
+        customer_orders = self.orders_by_customer.get(selected_customer['id'], [])
+        
+        # При выборе другого клиента снова показывается только первая страница
+        if selected_customer['id'] != self._order_tree_customer_id:
+            self._order_tree_customer_id = selected_customer['id']
+            self._order_tree_limit = ORDER_TREE_PAGE_SIZE
+        visible_orders = customer_orders[:self._order_tree_limit]
+        
+        # iid строки привязан к объекту заказа, поэтому при повторной загрузке
+        # таблица обновляется только для добавленных, удаленных и измененных заказов
+        rows = {str(id(order)): self.get_order_display_values(order) for order in visible_orders}
+        
+        stale_rows = [iid for iid in self._order_tree_rows if iid not in rows]
+        if stale_rows:
+            self.orders_tree.delete(*stale_rows)
+        for index, (iid, values) in enumerate(rows.items()):
+            if iid not in self._order_tree_rows:
+                self.orders_tree.insert('', index, iid=iid, values=values)
+            elif self._order_tree_rows[iid] != values:
+                self.orders_tree.item(iid, values=values)
+        
+        # Порядок строк восстанавливается, только если он разошелся со списком заказов
+        if self.orders_tree.get_children() != tuple(rows):
+            for index, iid in enumerate(rows):
+                self.orders_tree.move(iid, '', index)
+        self._order_tree_rows = rows
+        
+        remaining = len(customer_orders) - len(visible_orders)
+        if remaining:
+            self.more_orders_button.configure(state=tk.NORMAL, text=f"Показать еще ({remaining})")
+        else:
+            self.more_orders_button.configure(state=tk.DISABLED, text="Показать еще")
         
-        # Заполнение данными
-        for order in customer_orders:
-            self.orders_tree.insert('', tk.END, values=(
+        # Обновление статистики
+        self.update_order_statistics(selected_customer['id'])
+    
+    def show_more_orders(self):
+        """Добавление в таблицу следующей страницы заказов клиента"""
+        self._order_tree_limit += ORDER_TREE_PAGE_SIZE
+        self.load_orders_for_customer()
+    
+    def get_order_display_values(self, order):
+        """Строка таблицы заказов, отформатированная один раз до следующего изменения заказов"""
+        values = self._order_display_cache.get(id(order))
+        if values is None:
+            values = (
                 order['id'],
                 order.get('date', ''),
                 order.get('book_title', ''),
@@ -2154,19 +2624,26 @@ class CustomerManagementSystem:
                 f"{order.get('discount', 0):.1f}%",
                 f"{order.get('total_amount', 0):.2f} руб.",
                 order.get('status', 'Ожидает оплаты')
-            ))
-        
-        # Обновление статистики
-        self.update_order_statistics(selected_customer['id'])
+            )
+            self._order_display_cache[id(order)] = values
+        return values
     
     def update_order_statistics(self, customer_id):
         """Обновление статистики заказов"""
-        stats = self.order_manager.get_customer_order_statistics(customer_id, self.orders)
+        order_stats = self.get_order_statistics_frame()
         
-        self.stats_vars['total_orders'].set(str(stats['total_orders']))
-        self.stats_vars['total_amount'].set(f"{stats['total_amount']:.2f} руб.")
-        self.stats_vars['avg_order'].set(f"{stats['average_order']:.2f} руб.")
-        self.stats_vars['last_order'].set(stats['last_order'] or "Нет заказов")
+        if customer_id in order_stats.index:
+            stats = order_stats.loc[customer_id]
+            total_orders = int(stats['total_orders'])
+            total_amount = float(stats['total_amount'])
+            last_order = stats['last_order'] if pd.notna(stats['last_order']) else None
+        else:
+            total_orders, total_amount, last_order = 0, 0.0, None
+        
+        self.stats_vars['total_orders'].set(str(total_orders))
+        self.stats_vars['total_amount'].set(f"{total_amount:.2f} руб.")
+        self.stats_vars['avg_order'].set(f"{total_amount / total_orders if total_orders else 0:.2f} руб.")
+        self.stats_vars['last_order'].set(last_order or "Нет заказов")
     
     def generate_report(self):
         """Генерация отчета"""
@@ -2176,7 +2653,8 @@ class CustomerManagementSystem:
             date_to = self.date_to.get()
             
             report_data = self.report_generator.generate_report(
-                report_type, self.customers, self.orders, date_from, date_to
+                report_type, self.customers, self.orders, date_from, date_to,
+                orders_df=self.get_orders_frame()
             )
             
             self.report_text.delete(1.0, tk.END)
@@ -2195,37 +2673,150 @@ class CustomerManagementSystem:
             )
             
             if file_path:
-                # Создание DataFrame с данными отчета
-                df = pd.DataFrame([{
-                    'ID': c['id'],
-                    'ФИО': c.get('full_name', ''),
-                    'Email': c.get('email', ''),
-                    'Телефон': c.get('phone', ''),
-                    'Дата регистрации': c.get('registration_date', ''),
-                    'Всего заказов': len(self.order_manager.get_customer_orders(c['id'], self.orders)),
-                    'Общая сумма': self.order_manager.get_customer_total_spent(c['id'], self.orders)
-                } for c in self.customers])
+                # Колонки клиентов соединяются со статистикой заказов, посчитанной groupby
+                report_columns = {
+                    'id': 'ID',
+                    'full_name': 'ФИО',
+                    'email': 'Email',
+                    'phone': 'Телефон',
+                    'registration_date': 'Дата регистрации'
+                }
+                df = pd.DataFrame.from_records(self.customers, columns=list(report_columns)).fillna('')
+                order_stats = self.get_order_statistics_frame()[['total_orders', 'total_amount']]
+                df = df.join(order_stats, on='id')
+                df['total_orders'] = df['total_orders'].fillna(0).astype(int)
+                df['total_amount'] = df['total_amount'].fillna(0.0).astype(float)
+                df = df.rename(columns={**report_columns, 'total_orders': 'Всего заказов', 'total_amount': 'Общая сумма'})
                 
-                df.to_excel(file_path, index=False)
-                messagebox.showinfo("Успех", f"Отчет экспортирован в:\n{file_path}")
+                # Таблица уже собрана, в фоне выполняется только запись файла
+                self.run_export_in_background(
+                    lambda: write_excel_values(df, file_path),
+                    f"Отчет экспортирован в:\n{file_path}"
+                )
         
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось экспортировать: {e}")
     
+    def run_in_background(self, task, on_done):
+        """
+        Выполнение долгой операции (файл, сеть) в фоновом потоке
+        
+        Args:
+            task: Функция без аргументов
+            on_done: Функция (результат, ошибка), вызываемая в главном потоке
+        """
+        future = self._background.submit(task)
+        self._poll_background(future, on_done)
+    
+    def _poll_background(self, future, on_done):
+        """Ожидание фоновой операции через after: Tk вызывается только из главного потока"""
+        if not future.done():
+            self.root.after(BACKGROUND_POLL_MS, self._poll_background, future, on_done)
+            return
+        
+        error = future.exception()
+        on_done(None if error else future.result(), error)
+    
+    def run_export_in_background(self, export, success_message):
+        """
+        Выполнение записи файла экспорта в фоновом потоке
+        
+        Args:
+            export: Функция без аргументов, записывающая файл
+            success_message: Сообщение, показываемое после успешной записи
+        """
+        self.run_in_background(export, lambda _, error: self._finish_export(success_message, error))
+    
+    def _finish_export(self, success_message, error):
+        """Сообщение о результате фонового экспорта"""
+        if error:
+            logging.error(f"Ошибка экспорта: {error}")
+            messagebox.showerror("Ошибка", f"Не удалось экспортировать: {error}")
+        else:
+            messagebox.showinfo("Успех", success_message)
+    
+    def rebuild_customer_indexes(self):
+        """Перестроение индексов клиентов по ID, по имени и для поиска"""
+        self._customers_by_id = {}
+        self._customers_by_name = {}
+        self._customer_search_blobs = []
+        for customer in self.customers:
+            # При дубликатах сохраняется первое совпадение, как при линейном поиске
+            # Имя в нижнем регистре хранится в самом клиенте, чтобы не пересчитывать при сравнениях
+            customer['full_name_ci'] = customer['full_name'].strip().lower()
+            self._customers_by_id.setdefault(customer['id'], customer)
+            self._customers_by_name.setdefault(customer['full_name_ci'], customer)
+            
+            # Поля поиска склеиваются через перевод строки, чтобы запрос не совпадал на стыке полей
+            search_blob = '\n'.join([customer['full_name_ci']] + [
+                str(customer.get(field) or '').lower()
+                for field in ('email', 'phone', 'notes')
+            ])
+            self._customer_search_blobs.append((search_blob, customer))
+        
+        # Все имена одной строкой через перевод строки для поиска подстроки в C (str.find);
+        # позиция начала каждого имени переводит найденное смещение обратно в клиента
+        self._customer_name_starts = []
+        position = 0
+        for customer in self.customers:
+            self._customer_name_starts.append(position)
+            position += len(customer['full_name_ci']) + 1
+        self._customer_names_blob = '\n'.join(customer['full_name_ci'] for customer in self.customers)
+    
+    def rebuild_order_indexes(self):
+        """Перестроение индексов заказов по ID клиента"""
+        self.orders_by_customer = defaultdict(list)
+        self.total_spent_by_customer = defaultdict(float)
+        for order in self.orders:
+            self.orders_by_customer[order['customer_id']].append(order)
+            self.total_spent_by_customer[order['customer_id']] += order.get('total_amount', 0)
+            
+            # Часто повторяющиеся значения интернируются независимо от источника заказа
+            # (CSV, Excel, БД, диалог), чтобы одинаковые строки были одним объектом
+            for field in INTERNED_ORDER_FIELDS:
+                value = order.get(field)
+                if isinstance(value, str):
+                    order[field] = sys.intern(value)
+        self.invalidate_orders_frame()
+    
+    def invalidate_orders_frame(self):
+        """Сброс колоночного представления и кэша строк таблицы после изменения заказов"""
+        self._order_display_cache = {}
+        self._orders_df = None
+        self._order_stats_df = None
+    
+    def get_orders_frame(self):
+        """Колоночное представление заказов для агрегаций (строится лениво)"""
+        if self._orders_df is None:
+            orders_df = pd.DataFrame.from_records(self.orders, columns=ORDER_FIELDS)
+            # Колонки с небольшим числом различных значений хранятся как категории
+            for field in INTERNED_ORDER_FIELDS:
+                orders_df[field] = orders_df[field].astype('category')
+            self._orders_df = orders_df
+        return self._orders_df
+    
+    def get_order_statistics_frame(self):
+        """Статистика заказов по всем клиентам за один проход groupby"""
+        if self._order_stats_df is None:
+            orders_df = self.get_orders_frame()
+            self._order_stats_df = orders_df.assign(
+                date=orders_df['date'].replace('', np.nan)
+            ).groupby('customer_id').agg(
+                total_orders=('customer_id', 'size'),
+                total_amount=('total_amount', 'sum'),
+                last_order=('date', 'max')
+            )
+        return self._order_stats_df
+    
     def find_customer_by_id(self, customer_id):
         """Поиск клиента по ID"""
-        for customer in self.customers:
-            if customer['id'] == customer_id:
-                return customer
-        return None
+        return self._customers_by_id.get(customer_id)
     
     def get_selected_customer_from_listbox(self):
         """Получение выбранного клиента из списка"""
         selection = self.customer_listbox.curselection()
         if selection:
-            customer_name = self.customer_listbox.get(selection[0])
-            customer_id = int(customer_name.split(" - ")[0])
-            return self.find_customer_by_id(customer_id)
+            return self._customer_listbox_rows[selection[0]]
         return None
     
     def get_selected_order(self):
@@ -2241,8 +2832,13 @@ class CustomerManagementSystem:
     def update_customer_listbox(self):
         """Обновление списка клиентов"""
         self.customer_listbox.delete(0, tk.END)
-        for customer in self.customers:
-            self.customer_listbox.insert(tk.END, f"{customer['id']} - {customer['full_name']}")
+        self._customer_listbox_rows = list(self.customers)
+        self._customer_listbox_index = {}
+        for row, customer in enumerate(self._customer_listbox_rows):
+            self._customer_listbox_index.setdefault(customer['id'], row)
+        if self._customer_listbox_rows:
+            self.customer_listbox.insert(tk.END, *(f"{customer['id']} - {customer['full_name']}"
+                                                   for customer in self._customer_listbox_rows))
     
     def on_customer_select(self, event):
         """Обработка выбора клиента в списке"""
@@ -2255,60 +2851,151 @@ class CustomerManagementSystem:
             customer_id = self.customer_tree.item(selection[0])['values'][0]
             self.edit_customer(customer_id)
     
-    def load_data_from_csv(self):
-        """Загрузка данных из CSV файлов"""
+    def load_data_from_csv(self, on_complete=None):
+        """
+        Загрузка данных из CSV файлов в фоновом потоке
+        
+        Args:
+            on_complete: Функция, вызываемая в главном потоке после загрузки
+        """
+        self._csv_loading = True
+        
+        # Индикатор загрузки, пока файлы читаются в фоне; передается обработчику завершения
+        progress = ttk.Progressbar(self.root, mode='indeterminate')
+        progress.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
+        progress.start()
+        
+        thread = threading.Thread(target=self._read_csv_data, args=(progress, on_complete), daemon=True)
+        thread.start()
+    
+    def is_data_locked(self):
+        """
+        Проверка, что данные сейчас нельзя менять
+        
+        Returns:
+            bool: True, если идет загрузка из CSV (пользователь получает сообщение)
+        """
+        if self._csv_loading:
+            messagebox.showinfo("Загрузка данных", "Дождитесь окончания загрузки данных из CSV")
+            return True
+        return False
+    
+    def _read_csv_data(self, progress, on_complete):
+        """Чтение CSV файлов в фоновом потоке (без обращения к виджетам Tk)"""
+        customers = orders = error = None
         try:
             # Загрузка клиентов из clients_100.csv
             clients_file = "clients_100.csv"
             if os.path.exists(clients_file):
-                self.load_customers_from_csv(clients_file)
+                customers = self.read_customers_csv(clients_file)
             else:
                 logging.warning(f"Файл {clients_file} не найден. Используются тестовые данные.")
-                self.load_sample_customers()
             
             # Загрузка заказов из book_orders.csv
+            # (без файла клиентов заказы привязываются к тестовым клиентам в главном потоке)
             orders_file = "book_orders.csv"
-            if os.path.exists(orders_file):
-                self.load_orders_from_csv(orders_file)
-            else:
+            if not os.path.exists(orders_file):
                 logging.warning(f"Файл {orders_file} не найден. Используются тестовые данные.")
-                self.load_sample_orders()
+            elif customers is not None:
+                orders = self.read_orders_csv(orders_file, customers)
+        
+        except Exception as e:
+            logging.error(f"Ошибка загрузки CSV данных: {e}")
+            error = e
+        
+        # Обновление данных и интерфейса выполняется в главном потоке
+        self.root.after(0, self._finish_csv_load, progress, customers, orders, error, on_complete)
+    
+    def _finish_csv_load(self, progress, customers, orders, error, on_complete):
+        """Применение загруженных из CSV данных в главном потоке"""
+        progress.stop()
+        progress.destroy()
+        self._csv_loading = False
+        
+        try:
+            if error:
+                raise error
             
-            self.load_customers()
+            if customers is not None:
+                self.customers = customers
+                self.next_customer_id = len(customers) + 1
+                self.rebuild_customer_indexes()
+            else:
+                self.load_sample_customers()
             
+            if orders is not None:
+                self.orders = orders
+                self.next_order_id = len(orders) + 1
+                self.rebuild_order_indexes()
+            elif customers is None and os.path.exists("book_orders.csv"):
+                self.load_orders_from_csv("book_orders.csv")
+            else:
+                self.load_sample_orders()
+        
         except Exception as e:
-            logging.error(f"Ошибка загрузки CSV данных: {e}")
             messagebox.showerror("Ошибка", f"Не удалось загрузить данные из CSV: {e}")
             # Загрузка тестовых данных в случае ошибки
             self.load_sample_data()
+        
+        self.load_customers()
+        self.update_data_info()
+        
+        if on_complete:
+            on_complete()
     
     def load_customers_from_csv(self, file_path):
         """Загрузка клиентов из CSV файла"""
+        self.customers = self.read_customers_csv(file_path)
+        self.next_customer_id = len(self.customers) + 1
+        self.rebuild_customer_indexes()
+    
+    def read_customers_csv(self, file_path):
+        """Чтение клиентов из CSV файла без изменения состояния приложения"""
         try:
-            df = pd.read_csv(file_path, encoding='utf-8')
-            logging.info(f"Загрузка клиентов из {file_path}, найдено {len(df)} записей")
-            
-            self.customers = []
-            self.next_customer_id = 1
-            
-            for index, row in df.iterrows():
-                customer = {
-                    'id': self.next_customer_id,
-                    'full_name': self.clean_string(row.get('ФИО', row.get('full_name', ''))),
-                    'email': self.clean_string(row.get('Email', row.get('email', ''))),
-                    'phone': self.clean_string(row.get('Телефон', row.get('phone', ''))),
-                    'registration_date': self.parse_date(row.get('Дата регистрации', row.get('registration_date', date.today()))),
-                    'notes': self.clean_string(row.get('Примечания', row.get('notes', ''))),
-                    'total_orders': 0,
-                    'total_spent': 0.0
-                }
+            logging.info(f"Загрузка клиентов из {file_path}")
+            
+            # Маппинг колонок файла на поля клиента (русское название имеет приоритет)
+            column_mapping = {
+                'full_name': ['ФИО', 'full_name'],
+                'email': ['Email', 'email'],
+                'phone': ['Телефон', 'phone'],
+                'registration_date': ['Дата регистрации', 'registration_date'],
+                'notes': ['Примечания', 'notes']
+            }
+            
+            # Читаются только известные колонки, остальные пропускаются парсером
+            known_columns = {col for columns in column_mapping.values() for col in columns}
+            
+            customers = []
+            next_customer_id = 1
+            total_rows = 0
+            
+            # Чтение файла блоками, чтобы пиковая память не зависела от размера файла
+            for df in pd.read_csv(file_path, encoding='utf-8', dtype=str, chunksize=CSV_CHUNK_SIZE,
+                                  usecols=lambda col: col in known_columns):
+                total_rows += len(df)
+                
+                # Обработка данных целыми колонками вместо построчного iterrows()
+                data = pd.DataFrame(index=df.index)
+                for field, possible_columns in column_mapping.items():
+                    column = next((col for col in possible_columns if col in df.columns), None)
+                    data[field] = df[column] if column else np.nan
+                
+                for field in ('full_name', 'email', 'phone', 'notes'):
+                    data[field] = self.clean_string_column(data[field])
+                data['registration_date'] = self.parse_date_column(data['registration_date'])
                 
                 # Пропускаем пустые записи
-                if customer['full_name']:
-                    self.customers.append(customer)
-                    self.next_customer_id += 1
+                data = data[data['full_name'] != '']
+                data.insert(0, 'id', np.arange(next_customer_id, next_customer_id + len(data)))
+                data['total_orders'] = 0
+                data['total_spent'] = 0.0
+                
+                customers.extend(data.to_dict('records'))
+                next_customer_id += len(data)
             
-            logging.info(f"Успешно загружено {len(self.customers)} клиентов")
+            logging.info(f"Успешно загружено {len(customers)} клиентов из {total_rows} записей")
+            return customers
             
         except Exception as e:
             logging.error(f"Ошибка загрузки клиентов из CSV: {e}")
@@ -2316,110 +3003,196 @@ class CustomerManagementSystem:
     
     def load_orders_from_csv(self, file_path):
         """Загрузка заказов из CSV файла"""
+        self.orders = self.read_orders_csv(file_path, self.customers)
+        self.next_order_id = len(self.orders) + 1
+        self.rebuild_order_indexes()
+    
+    def read_orders_csv(self, file_path, customers):
+        """Чтение заказов из CSV файла с привязкой к переданным клиентам"""
         try:
-            df = pd.read_csv(file_path, encoding='utf-8')
-            logging.info(f"Загрузка заказов из {file_path}, найдено {len(df)} записей")
+            logging.info(f"Загрузка заказов из {file_path}")
+            
+            # Маппинг колонок файла на поля заказа (первое найденное название имеет приоритет)
+            column_mapping = {
+                'id': ['ID_заказа', 'order_id'],
+                'customer_name': ['ФИО_клиента', 'client_name'],
+                'date': ['Дата_заказа', 'order_date'],
+                'book_title': ['Название_книги', 'product_name'],
+                'author': ['Автор'],
+                'genre': ['Жанр'],
+                'quantity': ['Количество', 'quantity'],
+                'price': ['Цена_за_шт', 'price'],
+                'discount': ['Скидка_%', 'discount'],
+                'final_price': ['Итоговая_цена', 'final_price'],
+                'total_amount': ['Общая_сумма', 'total_amount'],
+                'status': ['Статус_заказа', 'status'],
+                'delivery_method': ['Способ_доставки', 'delivery_method'],
+                'order_notes': ['Примечание_к_заказу', 'notes']
+            }
+            column_defaults = {'status': 'Ожидает оплаты'}
+            text_fields = ('customer_name', 'book_title', 'author', 'genre', 'status', 'delivery_method', 'order_notes')
+            float_fields = ('price', 'discount', 'final_price', 'total_amount')
+            known_columns = {col for columns in column_mapping.values() for col in columns}
             
-            self.orders = []
-            self.next_order_id = 1
+            orders = []
+            next_order_id = 1
+            total_rows = 0
+            coerced_values = 0
+            
+            # Соответствие имени клиента в нижнем регистре его ID для соединения с заказами
+            # (при дубликатах имени используется первый клиент)
+            customer_ids_by_name = {}
+            for customer in customers:
+                customer_ids_by_name.setdefault(customer['full_name'].strip().lower(), customer['id'])
+            customer_ids_by_name = pd.Series(customer_ids_by_name, dtype='float64')
             
-            for index, row in df.iterrows():
-                # Ищем клиента по имени
-                customer_name = self.clean_string(row.get('ФИО_клиента', row.get('client_name', '')))
-                customer = self.find_customer_by_name(customer_name)
+            # Чтение файла блоками, все преобразования выполняются целыми колонками
+            for df in pd.read_csv(file_path, encoding='utf-8', dtype=str, chunksize=CSV_CHUNK_SIZE,
+                                  usecols=lambda col: col in known_columns):
+                total_rows += len(df)
                 
-                if customer:
-                    order = {
-                        'id': self.clean_string(row.get('ID_заказа', row.get('order_id', f'ORD{self.next_order_id:03d}'))),
-                        'customer_id': customer['id'],
-                        'customer_name': customer_name,
-                        'date': self.parse_date(row.get('Дата_заказа', row.get('order_date', date.today()))),
-                        'book_title': self.clean_string(row.get('Название_книги', row.get('product_name', ''))),
-                        'author': self.clean_string(row.get('Автор', '')),
-                        'genre': self.clean_string(row.get('Жанр', '')),
-                        'quantity': self.parse_int(row.get('Количество', row.get('quantity', 1))),
-                        'price': self.parse_float(row.get('Цена_за_шт', row.get('price', 0))),
-                        'discount': self.parse_float(row.get('Скидка_%', row.get('discount', 0))),
-                        'final_price': self.parse_float(row.get('Итоговая_цена', row.get('final_price', 0))),
-                        'total_amount': self.parse_float(row.get('Общая_сумма', row.get('total_amount', 0))),
-                        'status': self.clean_string(row.get('Статус_заказа', row.get('status', 'Ожидает оплаты'))),
-                        'delivery_method': self.clean_string(row.get('Способ_доставки', row.get('delivery_method', ''))),
-                        'order_notes': self.clean_string(row.get('Примечание_к_заказу', row.get('notes', '')))
-                    }
-                    
-                    self.orders.append(order)
-                    self.next_order_id += 1
-                else:
-                    logging.warning(f"Клиент не найден для заказа: {customer_name}")
+                data = pd.DataFrame(index=df.index)
+                for field, possible_columns in column_mapping.items():
+                    column = next((col for col in possible_columns if col in df.columns), None)
+                    data[field] = df[column] if column else column_defaults.get(field, np.nan)
+                
+                for field in text_fields:
+                    data[field] = self.clean_string_column(data[field])
+                
+                data['date'] = self.parse_date_column(data['date'])
+                
+                # Числовые колонки: нераспознанные значения заменяются значениями по умолчанию
+                quantity = pd.to_numeric(data['quantity'], errors='coerce')
+                coerced_values += int((quantity.isna() & data['quantity'].notna()).sum())
+                data['quantity'] = quantity.fillna(1).astype(int)
+                for field in float_fields:
+                    values = pd.to_numeric(data[field], errors='coerce')
+                    coerced_values += int((values.isna() & data[field].notna()).sum())
+                    data[field] = values.fillna(0.0).astype(float)
+                
+                # Ищем клиентов по имени одним хеш-соединением по колонке
+                customer_ids = data['customer_name'].str.lower().map(customer_ids_by_name)
+                found = customer_ids.notna()
+                missing_names = data.loc[~found, 'customer_name'].unique()
+                if len(missing_names):
+                    logging.warning(f"Клиенты не найдены для {int((~found).sum())} заказов: {', '.join(missing_names)}")
+                
+                data = data[found]
+                data.insert(1, 'customer_id', customer_ids[found].astype(int))
+                
+                # ID генерируется, только если колонки с ID нет в файле
+                if not any(col in df.columns for col in column_mapping['id']):
+                    data['id'] = [f'ORD{n:03d}' for n in range(next_order_id, next_order_id + len(data))]
+                data['id'] = self.clean_string_column(data['id'])
+                
+                orders.extend(data.to_dict('records'))
+                next_order_id += len(data)
             
-            logging.info(f"Успешно загружено {len(self.orders)} заказов")
+            if coerced_values:
+                logging.warning(f"Не удалось распарсить {coerced_values} числовых значений, использованы значения по умолчанию")
             
+            logging.info(f"Успешно загружено {len(orders)} заказов из {total_rows} записей")
+            return orders
+        
         except Exception as e:
             logging.error(f"Ошибка загрузки заказов из CSV: {e}")
             raise
     
     def clean_string(self, value):
         """Очистка строковых значений"""
-        if pd.isna(value):
+        if value is None:
             return ""
         return str(value).strip()
     
-    def parse_date(self, value):
-        """Парсинг даты из различных форматов"""
-        if pd.isna(value):
-            return date.today().strftime("%Y-%m-%d")
-        
-        value_str = str(value).strip()
+    def clean_string_column(self, series):
+        """Векторизованная очистка строковой колонки"""
+        return series.fillna('').astype(str).str.strip()
+    
+    def parse_date_column(self, series):
+        """Векторизованный парсинг колонки дат из различных форматов"""
+        # Разбор идет по позициям: части результата собираются по индексу, который может повторяться
+        values = series.astype('string').str.strip().reset_index(drop=True)
+        separators = values.str.extract(DATE_SEPARATOR_RE, expand=False)
+        
+        # Значения группируются по разделителю, каждый формат разбирает
+        # только еще не распознанные строки своей группы. Результат каждого формата
+        # сразу переводится в строки: общий буфер datetime64[ns] не вмещает даты
+        # вне 1677-2262 годов, а разрешение результата pandas выбирает сам
+        parsed_parts = []
+        for separator, formats in DATE_FORMATS_BY_SEPARATOR.items():
+            remaining = values[separators == separator]
+            for fmt in formats:
+                if remaining.empty:
+                    break
+                converted = pd.to_datetime(remaining, format=fmt, errors='coerce')
+                recognized = converted.notna()
+                parsed_parts.append(converted[recognized].dt.strftime("%Y-%m-%d").astype(object))
+                remaining = remaining[~recognized]
+        
+        result = pd.Series(None, index=values.index, dtype=object)
+        for part in parsed_parts:
+            result[part.index] = part
+        
+        # Версии pandas, не выбирающие разрешение сами, дают NaT для дат вне диапазона
+        # наносекунд; оставшиеся значения разбираются по одному через strptime
+        unparsed = result.isna() & values.notna()
+        if unparsed.any():
+            result[unparsed] = values[unparsed].astype(object).map(self.parse_date_value)
+            unparsed = result.isna() & values.notna()
+        if unparsed.any():
+            logging.warning(f"Не удалось распарсить {int(unparsed.sum())} дат, используется сегодняшняя дата")
+        
+        result = result.fillna(today_iso())
+        result.index = series.index
+        return result
+    
+    @staticmethod
+    def parse_date_value(value_str):
+        """
+        Разбор одной строки даты через strptime
         
-        # Пробуем разные форматы дат
-        date_formats = [
-            "%Y-%m-%d",
-            "%d.%m.%Y",
-            "%m/%d/%Y",
-            "%d-%m-%Y",
-            "%Y/%m/%d"
-        ]
+        Args:
+            value_str (str): Очищенная строка даты
         
-        for fmt in date_formats:
+        Returns:
+            str: Дата в формате YYYY-MM-DD или None, если формат не распознан
+        """
+        match = DATE_SEPARATOR_RE.match(value_str)
+        if not match:
+            return None
+        for fmt in DATE_FORMATS_BY_SEPARATOR[match.group(1)]:
             try:
-                date_obj = datetime.strptime(value_str, fmt)
-                return date_obj.strftime("%Y-%m-%d")
+                return datetime.strptime(value_str, fmt).strftime("%Y-%m-%d")
             except ValueError:
                 continue
-        
-        # Если не удалось распарсить, используем сегодняшнюю дату
-        logging.warning(f"Не удалось распарсить дату: {value_str}, используется сегодняшняя дата")
-        return date.today().strftime("%Y-%m-%d")
-    
-    def parse_int(self, value):
-        """Парсинг целых чисел"""
-        if pd.isna(value):
-            return 1
-        
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            logging.warning(f"Не удалось распарсить целое число: {value}, используется 1")
-            return 1
-    
-    def parse_float(self, value):
-        """Парсинг дробных чисел"""
-        if pd.isna(value):
-            return 0.0
-        
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            logging.warning(f"Не удалось распарсить дробное число: {value}, используется 0.0")
-            return 0.0
+        return None
     
     def find_customer_by_name(self, name):
         """Поиск клиента по имени"""
-        clean_name = self.clean_string(name).lower()
-        for customer in self.customers:
-            if customer['full_name'].lower() == clean_name:
-                return customer
-        return None
+        return self._customers_by_name.get(self.clean_string(name).lower())
+    
+    def find_customer_by_name_part(self, clean_name):
+        """
+        Поиск первого клиента, имя которого содержит строку
+        
+        Args:
+            clean_name (str): Часть имени в нижнем регистре
+        
+        Returns:
+            dict: Данные клиента или None
+        """
+        indexed = len(self._customer_name_starts)
+        if '\n' in clean_name:
+            # Перевод строки в запросе совпал бы на стыке двух имен в общей строке
+            remaining = self.customers
+        else:
+            position = self._customer_names_blob.find(clean_name)
+            if position >= 0 and indexed:
+                return self.customers[bisect_right(self._customer_name_starts, position) - 1]
+            # Клиенты, добавленные после перестроения индексов, проверяются напрямую
+            remaining = self.customers[indexed:]
+        
+        return next((customer for customer in remaining if clean_name in customer['full_name_ci']), None)
     
     def load_sample_customers(self):
         """Загрузка тестовых клиентов"""
@@ -2447,6 +3220,7 @@ class CustomerManagementSystem:
         ]
         self.customers = sample_customers
         self.next_customer_id = 3
+        self.rebuild_customer_indexes()
     
     def load_sample_orders(self):
         """Загрузка тестовых заказов"""
@@ -2488,6 +3262,7 @@ class CustomerManagementSystem:
         ]
         self.orders = sample_orders
         self.next_order_id = 3
+        self.rebuild_order_indexes()
     
     def load_sample_data(self):
         """Загрузка тестовых данных (для обратной совместимости)"""
@@ -2544,57 +3319,73 @@ class CustomerManagementSystem:
     
     def sync_with_metabase(self):
         """Синхронизация данных с Metabase (ручной запуск)"""
+        if self.is_data_locked():
+            return
         if not self.metabase_integration:
             messagebox.showwarning("Metabase", "Интеграция с Metabase не настроена")
             return
         
         try:
             # Сохраняем данные в БД перед синхронизацией
-            if self.db_manager.connection:
+            if self.db_manager.pool:
                 self.db_manager.save_to_database(self.customers, self.orders)
             
-            # Синхронизируем схему
-            if self.metabase_integration.sync_schema():
-                messagebox.showinfo("Metabase", "Данные успешно синхронизированы с Metabase")
-                
-                # Предлагаем открыть Metabase
-                if messagebox.askyesno("Metabase", "Хотите открыть Metabase в браузере?"):
-                    webbrowser.open(self.metabase_config.get("url", "http://localhost:3000"))
-            else:
-                messagebox.showwarning("Metabase", "Не удалось синхронизировать данные с Metabase")
+            # Синхронизируем схему, не блокируя интерфейс на время HTTP-запросов
+            self.run_in_background(self.metabase_integration.sync_schema, self._finish_metabase_sync)
                 
         except Exception as e:
             logging.error(f"Ошибка синхронизации с Metabase: {e}")
             messagebox.showerror("Metabase", f"Ошибка синхронизации: {str(e)}")
     
+    def _finish_metabase_sync(self, synced, error):
+        """Сообщение о результате фоновой синхронизации с Metabase"""
+        if error:
+            logging.error(f"Ошибка синхронизации с Metabase: {error}")
+            messagebox.showerror("Metabase", f"Ошибка синхронизации: {str(error)}")
+        elif synced:
+            messagebox.showinfo("Metabase", "Данные успешно синхронизированы с Metabase")
+            
+            # Предлагаем открыть Metabase
+            if messagebox.askyesno("Metabase", "Хотите открыть Metabase в браузере?"):
+                webbrowser.open(self.metabase_config.get("url", "http://localhost:3000"))
+        else:
+            messagebox.showwarning("Metabase", "Не удалось синхронизировать данные с Metabase")
+    
     def create_dashboard_in_metabase(self):
         """Создание дашборда в Metabase"""
         if not self.metabase_integration:
             messagebox.showwarning("Metabase", "Интеграция с Metabase не настроена")
             return
         
-        try:
-            dashboard_id = self.metabase_integration.create_dashboard(
+        self.run_in_background(
+            lambda: self.metabase_integration.create_dashboard(
                 name="Система управления клиентами",
                 description="Дашборд для анализа клиентов и заказов"
-            )
+            ),
+            self._finish_dashboard_creation
+        )
+    
+    def _finish_dashboard_creation(self, dashboard_id, error):
+        """Сообщение о результате фонового создания дашборда"""
+        if error:
+            logging.error(f"Ошибка создания дашборда: {error}")
+            messagebox.showerror("Metabase", f"Ошибка создания дашборда: {str(error)}")
+            return
+        
+        if dashboard_id:
+            dashboard_url = self.metabase_integration.get_dashboard_url(dashboard_id)
+            messagebox.showinfo("Metabase", f"Дашборд создан успешно!\n\nURL: {dashboard_url}")
             
-            if dashboard_id:
-                dashboard_url = self.metabase_integration.get_dashboard_url(dashboard_id)
-                messagebox.showinfo("Metabase", f"Дашборд создан успешно!\n\nURL: {dashboard_url}")
-                
-                # Открываем дашборд в браузере
-                if messagebox.askyesno("Metabase", "Открыть дашборд в браузере?"):
-                    webbrowser.open(dashboard_url)
-            else:
-                messagebox.showwarning("Metabase", "Не удалось создать дашборд")
-                
-        except Exception as e:
-            logging.error(f"Ошибка создания дашборда: {e}")
-            messagebox.showerror("Metabase", f"Ошибка создания дашборда: {str(e)}")
+            # Открываем дашборд в браузере
+            if messagebox.askyesno("Metabase", "Открыть дашборд в браузере?"):
+                webbrowser.open(dashboard_url)
+        else:
+            messagebox.showwarning("Metabase", "Не удалось создать дашборд")
     
     def manual_load_customers(self):
         """Ручная загрузка клиентов из CSV"""
+        if self.is_data_locked():
+            return
         file_path = filedialog.askopenfilename(
             title="Выберите CSV файл с клиентами",
             filetypes=[("CSV files", "*.csv"), ("Все файлы", "*.*")]
@@ -2611,6 +3402,8 @@ class CustomerManagementSystem:
     
     def manual_load_orders(self):
         """Ручная загрузка заказов из CSV"""
+        if self.is_data_locked():
+            return
         file_path = filedialog.askopenfilename(
             title="Выберите CSV файл с заказами",
             filetypes=[("CSV files", "*.csv"), ("Все файлы", "*.*")]
@@ -2627,11 +3420,13 @@ class CustomerManagementSystem:
     
     def reload_all_data(self):
         """Перезагрузка всех данных"""
+        if self.is_data_locked():
+            return
         try:
             self.setup_database()  # Сброс данных
-            self.load_data_from_csv()
-            self.update_data_info()
-            messagebox.showinfo("Успех", "Все данные перезагружены успешно")
+            self.load_data_from_csv(
+                on_complete=lambda: messagebox.showinfo("Успех", "Все данные перезагружены успешно")
+            )
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось перезагрузить данные: {e}")
     
@@ -2739,7 +3534,7 @@ class CustomerManagementSystem:
                     })
                 
                 df = pd.DataFrame(orders_data)
-                df.to_excel(file_path, index=False)
+                write_excel_values(df, file_path)
                 
                 messagebox.showinfo("Успех", f"Заказы экспортированы в:\n{file_path}")
         
@@ -2757,6 +3552,11 @@ class CustomerManagementSystem:
             )
             
             if file_path:
+                # Все агрегаты считаются по колонкам табличного представления заказов
+                orders_df = self.get_orders_frame()
+                order_count = len(orders_df)
+                total_revenue = orders_df['total_amount'].fillna(0).sum()
+                
                 with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
                     # 1. Общая статистика
                     general_stats = pd.DataFrame([{
@@ -2764,70 +3564,59 @@ class CustomerManagementSystem:
                         'Значение': len(self.customers)
                     }, {
                         'Показатель': 'Клиентов с заказами',
-                        'Значение': len(set(o['customer_id'] for o in self.orders))
+                        'Значение': orders_df['customer_id'].nunique()
                     }, {
                         'Показатель': 'Всего заказов',
-                        'Значение': len(self.orders)
+                        'Значение': order_count
                     }, {
                         'Показатель': 'Общая выручка',
-                        'Значение': sum(o.get('total_amount', 0) for o in self.orders)
+                        'Значение': total_revenue
                     }, {
                         'Показатель': 'Средний чек',
-                        'Значение': sum(o.get('total_amount', 0) for o in self.orders) / len(self.orders) if self.orders else 0
+                        'Значение': total_revenue / order_count if order_count else 0
                     }, {
                         'Показатель': 'Среднее количество товаров в заказе',
-                        'Значение': sum(o.get('quantity', 0) for o in self.orders) / len(self.orders) if self.orders else 0
+                        'Значение': orders_df['quantity'].fillna(0).sum() / order_count if order_count else 0
                     }])
                     
                     general_stats.to_excel(writer, sheet_name='Общая статистика', index=False)
                     
                     # 2. Статистика по статусам заказов
-                    if self.orders:
-                        status_stats = pd.DataFrame(self.orders)
-                        if 'status' in status_stats.columns:
-                            status_summary = status_stats['status'].value_counts().reset_index()
-                            status_summary.columns = ['Статус', 'Количество']
-                            status_summary.to_excel(writer, sheet_name='Статусы заказов', index=False)
+                    if order_count:
+                        status_summary = orders_df['status'].value_counts().reset_index()
+                        status_summary.columns = ['Статус', 'Количество']
+                        status_summary.to_excel(writer, sheet_name='Статусы заказов', index=False)
                     
                     # 3. Топ-10 клиентов
-                    if self.orders:
-                        customer_stats = []
-                        for customer in self.customers:
-                            customer_orders = self.order_manager.get_customer_orders(customer['id'], self.orders)
-                            if customer_orders:
-                                total_spent = self.order_manager.get_customer_total_spent(customer['id'], self.orders)
-                                customer_stats.append({
-                                    'ID': customer['id'],
-                                    'ФИО': customer.get('full_name', ''),
-                                    'Количество заказов': len(customer_orders),
-                                    'Общая сумма': total_spent,
-                                    'Средний чек': total_spent / len(customer_orders),
-                                    'Последний заказ': max([o['date'] for o in customer_orders]) if customer_orders else ''
-                                })
+                    if order_count:
+                        order_stats = self.get_order_statistics_frame()
+                        customers_df = pd.DataFrame.from_records(self.customers, columns=['id', 'full_name'])
+                        top_customers = customers_df.join(order_stats, on='id', how='inner')
                         
-                        if customer_stats:
-                            top_customers = pd.DataFrame(customer_stats)
+                        if not top_customers.empty:
+                            top_customers = pd.DataFrame({
+                                'ID': top_customers['id'],
+                                'ФИО': top_customers['full_name'].fillna(''),
+                                'Количество заказов': top_customers['total_orders'],
+                                'Общая сумма': top_customers['total_amount'],
+                                'Средний чек': top_customers['total_amount'] / top_customers['total_orders'],
+                                'Последний заказ': top_customers['last_order'].fillna('')
+                            })
                             top_customers = top_customers.sort_values('Общая сумма', ascending=False).head(10)
                             top_customers.to_excel(writer, sheet_name='Топ-10 клиентов', index=False)
                     
                     # 4. Статистика по жанрам
-                    if self.orders:
-                        genre_data = []
-                        for order in self.orders:
-                            genre = order.get('genre', 'Не указан')
-                            genre_data.append({
-                                'Жанр': genre,
-                                'Сумма': order.get('total_amount', 0),
-                                'Количество': order.get('quantity', 1)
-                            })
-                        
-                        if genre_data:
-                            genre_df = pd.DataFrame(genre_data)
-                            genre_summary = genre_df.groupby('Жанр').agg({
-                                'Сумма': ['sum', 'count', 'mean'],
-                                'Количество': 'sum'
-                            }).round(2)
-                            genre_summary.to_excel(writer, sheet_name='Статистика по жанрам')
+                    if order_count:
+                        genre_df = pd.DataFrame({
+                            'Жанр': orders_df['genre'].astype(object).fillna('Не указан'),
+                            'Сумма': orders_df['total_amount'].fillna(0),
+                            'Количество': orders_df['quantity'].fillna(1)
+                        })
+                        genre_summary = genre_df.groupby('Жанр').agg({
+                            'Сумма': ['sum', 'count', 'mean'],
+                            'Количество': 'sum'
+                        }).round(2)
+                        genre_summary.to_excel(writer, sheet_name='Статистика по жанрам')
                 
                 messagebox.showinfo("Успех", f"Статистический отчет экспортирован в:\n{file_path}")
         
@@ -2837,6 +3626,10 @@ class CustomerManagementSystem:
 
 
 if __name__ == "__main__":
+    # Логирование настраивается только при запуске программы и не перекрывает уже настроенное
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     root = tk.Tk()
     app = CustomerManagementSystem(root)
     root.mainloop()
\ No newline at end of file
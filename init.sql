@@ -36,4 +36,5 @@ CREATE TABLE IF NOT EXISTS orders (
 CREATE INDEX idx_customers_name ON customers(full_name);
 CREATE INDEX idx_orders_customer_id ON orders(customer_id);
 CREATE INDEX idx_orders_date ON orders(order_date);
-CREATE INDEX idx_orders_status ON orders(status);
\ No newline at end of file
+CREATE INDEX idx_orders_status ON orders(status);
+CREATE INDEX idx_orders_customer_date ON orders(customer_id, order_date DESC);
\ No newline at end of file
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("psycopg2")
+
+from client_management_system import CustomerManagementSystem, today_iso
+
+
+def parse(values):
+    app = CustomerManagementSystem.__new__(CustomerManagementSystem)
+    return app.parse_date_column(pd.Series(values)).tolist()
+
+
+def test_out_of_range_dates_next_to_normal_date():
+    assert parse(['0001-01-01', '2024-01-05', '1500-06-01', '9999-12-31']) == [
+        '1-01-01', '2024-01-05', '1500-06-01', '9999-12-31'
+    ]
+
+
+def test_formats_and_unparsed_values():
+    assert parse(['05.01.2024', '01/05/2024', '05-01-2024', '2024/01/05', 'bad', None]) == [
+        '2024-01-05', '2024-01-05', '2024-01-05', '2024-01-05', today_iso(), today_iso()
+    ]